@@ -5,22 +5,48 @@
 # F. Ihlen, Introduction to multifractal detrended fluctuation analysis in
 # Matlab, Front. Physiol., 2012, https://doi.org/10.3389/fphys.2012.00141
 
-from typing import Tuple
+import os
+import tempfile
+from concurrent.futures import Executor, ProcessPoolExecutor, \
+    ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Iterator, Tuple
 
 import numpy as np
-from numpy.polynomial.polynomial import polyfit, polyval
+from numpy.lib.stride_tricks import as_strided
 from .emddetrender import detrendedtimeseries
+from .singspect import Spectrum, hurst_exponents, spectrum
 
 __all__ = [
     'MFDFA',
+    'MFDFAResult',
+    'Profile',
     'eDFA'
 ]
 
+# Ratio of the standard deviation of the residuals of a segment to the
+# rounding of its values below which the residuals are recalculated in double
+# precision, see _detrended_variances(). The relative error of the variance
+# is then at most about 2 / _ROUNDING
+_ROUNDING = 2 ** 12
+
+# Ratio of the residual sum of squares of a segment to the estimated rounding
+# of the difference of prefix sums below which the segment is projected
+# directly, see _moment_variances(). The relative error of the variance is
+# then about 1e-6
+_CANCELLATION = 2 ** 16
+
+# Position of the moving average of each MF-DMA backend, see _dma_variances()
+_DMA = {'dma': 0.5, 'dma-backward': 0., 'dma-centred': 0.5, 'dma-forward': 1.}
+
 
 def MFDFA(timeseries: np.ndarray, lag: np.ndarray, order: int = 1,
           q: np.ndarray = 2, stat: bool = False, modified: bool = False,
-          extensions: dict = {'EMD': False, 'eDFA': False, 'window': False}
-          ) -> Tuple[np.array, np.ndarray]:
+          extensions: dict = {'EMD': False, 'eDFA': False, 'window': False},
+          backend: str = 'projection', out: Tuple[np.ndarray, ...] = None,
+          memory: int = 2 ** 27, n_jobs: int = 1, executor='thread',
+          dtype: np.dtype = float) -> 'MFDFAResult':
     """
     Multifractal Detrended Fluctuation Analysis of timeseries. MFDFA generates
     a fluctuation function F²(q,s), with s the segment size and q the q-powers,
@@ -57,6 +83,14 @@ def MFDFA(timeseries: np.ndarray, lag: np.ndarray, order: int = 1,
     ----------
     timeseries: np.ndarray
         A 1-dimensional timeseries `(N, 1)`. The timeseries of length `N`.
+        Several timeseries of equal length can be given as an array `(N, M)`,
+        or of different lengths as a list of `M` 1-dimensional arrays, and
+        are analysed together in a single call. Timeseries larger than the
+        memory can be given as a `np.memmap`, e.g., of a raw binary file, or
+        as the path to a `.npy` file, see `memory`.
+        A `Profile` of the timeseries, prepared once, can be given instead,
+        to skip the preprocessing when analysing the same timeseries
+        repeatedly.
 
     lag: np.ndarray of ints
         An array with the window sizes to calculate (ints). Notice
@@ -65,17 +99,24 @@ def MFDFA(timeseries: np.ndarray, lag: np.ndarray, order: int = 1,
         lag > size of data / 4 since there is low statistics with < 4 windows
         to divide the timeseries.
 
-    order: int (default `1`)
+    order: int or list of ints (default `1`)
         The order of the polynomials to approximate. `order = 1` is the DFA1,
         which is a least-square fit of the data with a first order polynomial
         (a line), `order = 2` is a second-order polynomial, etc..
         `order = 0` skips the detrending process and hence gives the
         non-detrended fluctuation functions, i.e., simply Fluctuation Analysis.
+        A list of orders, e.g., `[1, 2, 3, 4]`, gives all of them in a single
+        pass, with the results in an additional last axis in the order given.
+        The segments are projected once onto the polynomials of the highest
+        order, and the lower orders follow from the same projections, since
+        the polynomial bases are nested. The lags are then filtered with the
+        highest order.
 
     q: np.ndarray (default `2`)
-        Fractal exponent to calculate. Array in `[-10,10]`. The values = 0
-        will be removed, since the code does not converge there. `q = 2` is
-        the standard Detrended Fluctuation Analysis as is set a default.
+        Fractal exponent to calculate. Array in `[-10,10]`. `q = 2` is the
+        standard Detrended Fluctuation Analysis as is set a default. For
+        `q = 0`, where the average of the q-powers does not converge, the
+        logarithmic average is taken instead, see Notes.
 
     stat: bool (default `False`)
         Calculates the standard deviation associated with each segment's
@@ -100,6 +141,73 @@ def MFDFA(timeseries: np.ndarray, lag: np.ndarray, order: int = 1,
         the number of steps the window shoud move over the data. `window = 1`
         will move window by `1` step. Since the timeseries is segmented at
         each lag lenght, any window choise > lag is only segmented once.
+        The overlapping segments are evaluated together, in blocks limited by
+        `memory`. For small steps and large lags, `backend = 'moments'` is
+        considerably faster, since it does not need to copy the segments.
+
+    backend: str (default `'projection'`)
+        How the detrended variance of each segment is obtained.
+     - `'projection'`: The segments of each lag are projected onto a cached
+        orthonormal polynomial basis. Cost of `O(N·order)` per lag.
+     - `'moments'`: The variances are obtained from prefix sums of the
+        moments `Y`, `Y²`, and `tᵏ·Y` of the profile, i.e., without any
+        segment reshaping or fitting. Cost of `O(N/lag·order²)` per lag,
+        which makes long sweeps over many lags nearly free. The prefix sums
+        are taken over detrended blocks a few times longer than the lag,
+        keeping the cancellation errors bounded. The segments whose
+        residuals are too small for the difference of the sums, e.g., of
+        smooth profiles of long series with `modified = True`, are projected
+        as in `'projection'`, which makes these slower. Expect agreement
+        with `'projection'` up to ~1e-6 relative, not machine precision.
+     - `'dma-backward'`, `'dma-centred'`, `'dma-forward'`: Multifractal
+        Detrending Moving Average (MF-DMA) [Gu2010]. The trend is not a
+        polynomial fit of each segment, but the moving average of size `lag`
+        of the profile, over the `lag - 1` points before, around, or after
+        each point. The residuals of all points whose moving average is
+        within the series are segmented as the profile in the standard
+        option, and the variance of each segment is the mean of its squared
+        residuals. The moving averages and the sums over the segments follow
+        from cumulative sums, at a cost of `O(N)` per lag regardless of
+        `lag`. `order` is ignored. `'dma'` is `'dma-centred'`, which best
+        recovers the Hurst exponent.
+
+    out: np.ndarray or tuple of np.ndarray (default `None`)
+        Arrays in which to place the results, in the order they are returned
+        (after `lag`), e.g., `(f, f_std)` if `stat = True`. Each must have the
+        shape of the result it takes, i.e., with the filtered lags and
+        q-powers. Useful to avoid allocating the results anew when calling
+        `MFDFA()` repeatedly.
+
+    memory: int (default `2 ** 27`, i.e., 128 MB)
+        Approximate limit in bytes of the segments copied at once, e.g., the
+        overlapping segments of the moving `window`, which are otherwise
+        views of the timeseries. Larger values give fewer and larger blocks.
+        For a `np.memmap` (or `.npy` file) the analysis is out-of-core: the
+        mean and the profile are calculated in chunks of `memory` bytes into
+        a memory-mapped scratch file (in the temporary directory, see
+        `tempfile.gettempdir()`), and the segments of each lag detrended and
+        averaged in blocks of `memory` bytes. The EMD extension and the
+        `'moments'` and MF-DMA backends are not available out-of-core.
+
+    n_jobs: int (default `1`)
+        Number of workers over which the lags are distributed. Use `-1` for
+        as many workers as CPUs.
+
+    executor: str or concurrent.futures.Executor (default `'thread'`)
+        The workers of `n_jobs`. With `'thread'` the workers share the
+        profile of the timeseries, and numpy releases the GIL in the heavy
+        computations. With `'process'` the profile is placed in shared memory
+        (Python ≥ 3.8). An existing `Executor` can be given instead, and is
+        used regardless of `n_jobs`. Note that with processes the calling
+        script has to be guarded by `if __name__ == '__main__':` on platforms
+        that do not fork.
+
+    dtype: np.dtype (default `float`)
+        Floating-point type of the segments, the fits, and the q-powers of
+        the variances, e.g., `np.float32` to halve their memory and memory
+        traffic. The profile, i.e., the mean removal and the integration,
+        and the means over the segments are always in double precision, see
+        Notes.
 
     Returns
     -------
@@ -109,7 +217,54 @@ def MFDFA(timeseries: np.ndarray, lag: np.ndarray, order: int = 1,
 
     f: np.ndarray
         A array of shape `(size(lag),size(q))` of variances over the indicated
-        lag windows and the indicated q-fractal powers.
+        lag windows and the indicated q-fractal powers. For several
+        timeseries, of shape `(size(lag),size(q),M)`. For a list of orders,
+        with an additional last axis `size(order)`.
+
+    The results are returned as a `MFDFAResult`, which unpacks as the tuple
+    `(lag, f)`, followed by `f_std` if `stat = True` and by the eDFA if
+    requested, and from which the generalised Hurst exponents, the
+    multifractal spectrum, and the variances of the segments are obtained
+    on first access.
+
+    Notes
+    -----
+    For `q = 0` the fluctuation function is the limit `q → 0` of the one
+    above, i.e., the logarithmic average
+
+    .. math::
+
+       F_0(s) = \exp\Bigg\{\dfrac{1}{2N_s} \sum_{v=1}^{N_s}
+       \ln[F^2(v,s)]\Bigg\},
+
+    obtained from the same variances of the segments as the other q-powers,
+    and its standard deviation is the one of :math:`\ln[F^2(v,s)]/2`, in the
+    same exponential scale.
+
+    With `dtype = np.float32` the profile is kept in double precision, since
+    its values grow with the size of the series. The chord between the ends
+    of each segment, which any fit of `order ≥ 1` removes, is subtracted in
+    double precision before the segment is rounded, such that only its
+    fluctuations are kept to about 7 significant digits, and the q-powers
+    are taken relative to the typical variance of each lag, keeping them
+    within the range of single precision. The residuals of higher orders,
+    of lags of a few points more than the order, and of smooth profiles,
+    e.g., of random walks or with `modified = True`, can be too small to be
+    resolved in single precision. The segments whose residuals are below
+    `2¹²` times the rounding of their values are thus recalculated in double
+    precision, at the cost of the speed gained. Expect relative differences
+    to `float` of ~1e-4 or less in the fluctuation function, and less in
+    its slopes. For a random walk with `modified = True` of `10⁵` points or
+    more, the residuals of the smallest lags are at the limit of double
+    precision as well, and the two differ by the rounding of `float`, e.g.,
+    by ~1e-3 for `10⁵` and ~1e-1 for `10⁶` points for negative q. The sums
+    over the segments are always in double precision. The `'moments'`
+    backend takes its prefix sums in double precision regardless, since the
+    differences of sums cannot resolve single precision variances.
+
+    .. versionchanged:: 0.4.4
+        `q = 0` gives the logarithmic average, values `|q| < 0.1` are no
+        longer removed. Added the MF-DMA backends.
 
     References
     ----------
@@ -120,20 +275,78 @@ def MFDFA(timeseries: np.ndarray, lag: np.ndarray, order: int = 1,
         Koscielny-Bunde, S. Havlin, A. Bunde, H. E. Stanley. "Multifractal
         detrended fluctuation analysis of nonstationary time series." Physica
         A, 316(1-4), 87–114, 2002.
+    .. [Gu2010] G.-F. Gu and W.-X. Zhou. "Detrending moving average algorithm
+        for multifractals." Phys. Rev. E, 82(1), 011136, 2010.
     """
 
     # Force lag to be ints, ensure lag > order + 1
-    lag = lag[lag > order + 1]
+    lag = lag[lag > np.max(order) + 1]
     lag = np.round(lag).astype(int)
 
-    # Assert if timeseries is 1 dimensional
-    if timeseries.ndim > 1:
-        assert timeseries.shape[1] == 1, "Timeseries needs to be 1 dimensional"
+    # Several timeseries of different lengths. Series of equal length are
+    # analysed together, and the results stacked in the order given.
+    if isinstance(timeseries, list):
+        return _result(_MFDFA_list(timeseries, lag, order, q, stat, modified,
+                                   extensions, backend, out, memory, n_jobs,
+                                   executor, dtype), q, stat)
+
+    assert backend in ('projection', 'moments') or backend in _DMA, \
+        "'backend' must be 'projection', 'moments', or a 'dma' backend"
+
+    # A prepared profile is analysed as is. Otherwise the profile is
+    # prepared here, freshly allocated and read-only, such that the result
+    # recalculates the variances of the segments from it and not from the
+    # timeseries, which the caller may change or release
+    if not isinstance(timeseries, Profile):
+        timeseries = Profile(timeseries, modified,
+                             extensions.get('EMD', False), memory)
+
+    # A single timeseries returns the results without the last axis
+    single = timeseries.single
+
+    if isinstance(out, np.ndarray):
+        out = (out,)
+
+    # The results of a single timeseries are a view with the axis of the
+    # timeseries added. Only f and f_std carry the q-powers axis.
+    out_ = out
+    if out is not None and single is True:
+        out_ = tuple(o[:, :, None] if n <= stat else o
+                     for n, o in enumerate(out))
+
+    res = _MFDFA(timeseries, lag, order, q, stat, modified, extensions,
+                 backend, out_, memory, n_jobs, executor, dtype)
 
-    timeseries = timeseries.reshape(-1, 1)
+    if out is not None:
+        res = (res[0],) + tuple(out)
 
-    # Size of array
-    N = timeseries.shape[0]
+    elif single is True:
+        res = (res[0],) + tuple(r[:, :, 0] if n <= stat else r
+                                for n, r in enumerate(res[1:]))
+
+    res = _result(res, q, stat)
+
+    # What the variances of the segments are recalculated from, on request
+    res._source = (timeseries, order, extensions, backend, memory, dtype)
+
+    return res
+
+
+def _MFDFA(timeseries: np.ndarray, lag: np.ndarray, order: int,
+           q: np.ndarray, stat: bool, modified: bool, extensions: dict,
+           backend: str, out: Tuple[np.ndarray, ...] = None,
+           memory: int = 2 ** 27, n_jobs: int = 1, executor='thread',
+           dtype: np.dtype = float) -> Tuple[np.ndarray, ...]:
+    """
+    `MFDFA()` of the timeseries `(N, M)`, or of a `Profile`, vectorised over
+    the `M` timeseries, and with lags already filtered. Returns the same
+    results as `MFDFA()`, with the timeseries in the last axis, written into
+    `out` if given.
+
+    Notes
+    -----
+    .. versionadded:: 0.4.4
+    """
 
     # Assert if window is given, that it is int and > 0
     window = False
@@ -143,138 +356,1450 @@ def MFDFA(timeseries: np.ndarray, lag: np.ndarray, order: int = 1,
             assert isinstance(window, int), "'window' is not integer"
             assert window > 0, "'window' is not > 0"
 
-    # Fractal powers as floats
+    # Fractal powers as floats. q = 0 is the logarithmic average
     q = np.asarray_chkfinite(q, dtype=float)
 
-    # Ensure q≈0 is removed, since it does not converge. Limit set at |q| < 0.1
-    q = q[(q < -.1) + (q > .1)]
-
     # Reshape q to perform np.float_power
-    q = q.reshape(-1, 1)
+    q = q.reshape(-1, 1, 1, 1)
+
+    # Orders of the detrending, in the last axis of the results
+    orders = tuple(int(o) for o in np.atleast_1d(order))
+
+    # "Profile" of the series, of shape (M, N), such that each segment is
+    # contiguous in memory. A prepared profile carries its own `modified`
+    # and EMD detrending.
+    if isinstance(timeseries, Profile):
+        Y, emd = timeseries.Y, timeseries.EMD
+    else:
+        emd = extensions.get('EMD', False)
+        Y = _profile(timeseries, modified, emd, memory)
+
+    if isinstance(Y, np.memmap):
+        assert backend == 'projection', \
+            "Only 'projection' backend available for memory-mapped timeseries"
+
+    # Force order = 0 if the data is detrended with EMD, i.e., no need to do
+    # polynomial fittings anymore
+    if emd is not False:
+        orders = (0,) * len(orders)
+
+    # Number of timeseries
+    M = Y.shape[0]
+
+    # Check which extensions are requested
+    edfa = ('eDFA', True) in extensions.items()
+
+    # All results, i.e., f of (fractal)-variances, and f_std and f_eDFA if
+    # requested, are allocated once, or given by the caller. These are
+    # calculated with the orders in the last axis, which a single order
+    # gets as a view.
+    if np.ndim(order) == 0:
+        res = _allocate(_shapes(lag.size, q.size, M, stat, edfa), out)
+        res_ = [r[..., None] for r in res]
+    else:
+        res = res_ = _allocate(_shapes(lag.size, q.size, M, stat, edfa,
+                                       len(orders)), out)
+
+    args = (orders, q, stat, edfa, window, backend, memory, np.dtype(dtype))
+
+    # Each lag is independent, thus can be distributed over several workers
+    if n_jobs == 1 and not isinstance(executor, Executor):
+        _fluctuations(Y, lag, range(lag.size), *args, res_)
+    else:
+        _parallel_fluctuations(Y, lag, args, res_, n_jobs, executor)
+
+    return (lag,) + tuple(res)
+
+
+class Profile:
+    """
+    The profile of a timeseries, i.e., its preprocessing for `MFDFA()`: the
+    removal of the mean, the integration, the second integration if
+    `modified`, and the EMD detrending. When analysing the same timeseries
+    repeatedly, e.g., with different `q`, `order`, or lags, the profile can be
+    prepared once and given to `MFDFA()` in place of the timeseries, such that
+    each analysis only pays for the segments.
+
+    Parameters
+    ----------
+    timeseries: np.ndarray
+        A 1-dimensional timeseries `(N, 1)`, or a stack of timeseries of
+        equal length `(N, M)`, as for `MFDFA()`. Also a `np.memmap` or the
+        path to a `.npy` file.
+
+    modified: bool (default `False`)
+        Second integration of the timeseries, see `MFDFA()`.
+
+    EMD: list (default `False`)
+        The indices of the IMFs to detrend, see `extensions` of `MFDFA()`.
+        The polynomial detrending is then skipped, i.e., `order = 0`.
+
+    memory: int (default `2 ** 27`, i.e., 128 MB)
+        Size in bytes of the chunks of a memory-mapped timeseries, see
+        `MFDFA()`.
+
+    Attributes
+    ----------
+    Y: np.ndarray
+        The read-only profile, of shape `(M, N)`.
+
+    Examples
+    --------
+    >>> profile = Profile(X, modified = True)
+    >>> for order in [1, 2, 3]:
+    ...     lag, dfa = MFDFA(profile, lag, q = q, order = order)
+
+    Notes
+    -----
+    The `modified` and `extensions['EMD']` of `MFDFA()` are ignored for a
+    `Profile`, which carries its own.
+
+    .. versionadded:: 0.4.4
+    """
+
+    def __init__(self, timeseries: np.ndarray, modified: bool = False,
+                 EMD: list = False, memory: int = 2 ** 27):
+
+        # Timeseries stored in a .npy file are memory-mapped
+        if isinstance(timeseries, (str, os.PathLike)):
+            timeseries = np.load(timeseries, mmap_mode='r')
+
+        # Assert if timeseries is 1 dimensional or a stack of timeseries
+        assert timeseries.ndim <= 2, "Timeseries needs to be of shape (N, M)"
+
+        # A single timeseries returns the results without the last axis
+        self.single = timeseries.ndim == 1 or timeseries.shape[1] == 1
+
+        self.modified = modified
+        self.EMD = EMD
+
+        self.Y = _profile(timeseries.reshape(timeseries.shape[0], -1),
+                          modified, EMD, memory)
+        self.Y.flags.writeable = False
+
+
+class MFDFAResult(tuple):
+    """
+    The results of `MFDFA()`. Unpacks, indexes, and compares as the tuple
+    `(lag, f[, f_std][, f_eDFA])` returned by earlier versions, and gives
+    the quantities derived from the fluctuation function as attributes,
+    calculated on first access and kept, such that these are neither
+    recalculated nor require keeping track of the positions in the tuple.
+
+    Attributes
+    ----------
+    lag: np.ndarray of ints
+        Array of lags, as returned by `MFDFA()`.
+
+    q: np.ndarray
+        The fractal exponents, flattened.
+
+    f: np.ndarray
+        The fluctuation function, see `MFDFA()`.
+
+    f_std: np.ndarray
+        The standard deviation associated with each mean if `stat = True`,
+        otherwise `None`.
+
+    f_eDFA: np.ndarray
+        The eDFA if requested, otherwise `None`.
+
+    hurst: np.ndarray
+        The generalised Hurst exponents `h(q)`, of shape `f.shape[1:]`.
+
+    tau: np.ndarray
+        The scaling exponents `τ(q)`.
+
+    alpha: np.ndarray
+        The singularity strength `α`.
+
+    f_alpha: np.ndarray
+        The singularity spectrum `f(α)`.
+
+    variances: list of np.ndarray
+        The detrended variances `F²(v,s)` of the segments of each lag, of
+        shape `(segments,)`, with the axes of the timeseries and of the
+        orders appended as in `f`.
+
+    Examples
+    --------
+    >>> res = MFDFA(X, lag, q = q)
+    >>> plt.plot(res.alpha, res.f_alpha)
+    >>> lag, dfa = res
+
+    Notes
+    -----
+    The derived quantities follow from a single `singspect.spectrum()` with
+    its default limits of the fits, `spectrum()` gives the ones of other
+    limits. `tau`, `alpha`, and `f_alpha` need at least 2 values of `q`.
+
+    The variances of the segments are not kept by `MFDFA()`, as these take
+    more memory than the fluctuation function. On first access of
+    `variances` these are recalculated from the read-only profile of the
+    analysis, i.e., the `Profile` given to `MFDFA()` or the one it prepared
+    from the timeseries, which the result thus references, and not from
+    the timeseries itself, which may since have changed. They are not
+    available for a list of timeseries.
+
+    .. versionadded:: 0.4.4
+    """
+
+    def __new__(cls, lag: np.ndarray, q: np.ndarray, f: np.ndarray,
+                f_std: np.ndarray = None, f_eDFA: np.ndarray = None):
+
+        return super().__new__(cls, (lag, f) + tuple(
+            r for r in (f_std, f_eDFA) if r is not None))
+
+    def __init__(self, lag: np.ndarray, q: np.ndarray, f: np.ndarray,
+                 f_std: np.ndarray = None, f_eDFA: np.ndarray = None):
+
+        self.q = np.asarray(q, dtype=float).reshape(-1)
+        self.f_std = f_std
+        self.f_eDFA = f_eDFA
+
+        # The arguments of MFDFA() the variances are recalculated from
+        self._source = None
+
+        # The derived quantities already calculated
+        self._cache = {}
+
+    def __getnewargs__(self) -> tuple:
+        return self.lag, self.q, self.f, self.f_std, self.f_eDFA
+
+    @property
+    def lag(self) -> np.ndarray:
+        return self[0]
+
+    @property
+    def f(self) -> np.ndarray:
+        return self[1]
+
+    def spectrum(self, lim: list = [False, False]) -> Spectrum:
+        """
+        The multifractal spectrum of `singspect.spectrum()` of the
+        fluctuation function, with the lower and upper lag limits `lim` of
+        the fits. Calculated once for each `lim`.
+        """
+
+        key = ('spectrum',) + tuple(lim)
+        if key not in self._cache:
+            self._cache[key] = spectrum(self.lag, self.f, self.q, lim)
+
+        return self._cache[key]
+
+    @property
+    def hurst(self) -> np.ndarray:
+        # A single q has no spectrum, but its Hurst exponent
+        if self.q.size < 2:
+            if 'hurst' not in self._cache:
+                self._cache['hurst'] = hurst_exponents(self.lag, self.f,
+                                                       self.q)[1]
+            return self._cache['hurst']
+
+        return self.spectrum().hq
+
+    @property
+    def tau(self) -> np.ndarray:
+        return self.spectrum().tau
+
+    @property
+    def alpha(self) -> np.ndarray:
+        return self.spectrum().alpha
+
+    @property
+    def f_alpha(self) -> np.ndarray:
+        return self.spectrum().f
+
+    @property
+    def variances(self) -> list:
+        if 'variances' not in self._cache:
+            if self._source is None:
+                raise ValueError("The variances of the segments are not "
+                                 "available for a list of timeseries")
+            self._cache['variances'] = _variances(self.lag, *self._source)
+
+        return self._cache['variances']
+
+
+def _result(res: tuple, q: np.ndarray, stat: bool) -> MFDFAResult:
+    """
+    The tuple `(lag, f[, f_std][, f_eDFA])` of results as a `MFDFAResult`.
+
+    Notes
+    -----
+    .. versionadded:: 0.4.4
+    """
+
+    f_std = res[2] if stat is True else None
+    f_eDFA = res[2 + stat] if len(res) > 2 + stat else None
+
+    return MFDFAResult(res[0], q, res[1], f_std, f_eDFA)
+
+
+def _variances(lag: np.ndarray, profile: Profile, order: int,
+               extensions: dict, backend: str, memory: int, dtype: np.dtype
+               ) -> list:
+    """
+    Detrended variances of the segments of each lag of the `profile`,
+    recalculated as in `MFDFA()` from its arguments, with the segments in
+    the first axis, followed by the axis of the timeseries unless the
+    profile is of a single timeseries, and the one of the orders for a list
+    of orders.
+
+    Notes
+    -----
+    .. versionadded:: 0.4.4
+    """
+
+    orders = tuple(int(o) for o in np.atleast_1d(order))
+    if profile.EMD is not False:
+        orders = (0,) * len(orders)
+
+    window = extensions.get('window', False)
+
+    moments = {}
+    variances = []
+    for i in lag:
+        F = _segment_variances(profile.Y, i, orders, window, backend,
+                               memory, moments, dtype)
+
+        # Segments first, (segments, M, orders)
+        F = np.moveaxis(F, 1, 0)
+        if np.ndim(order) == 0:
+            F = F[..., 0]
+        if profile.single is True:
+            F = F[:, 0]
+
+        variances.append(F)
+
+    return variances
+
+
+def _profile(timeseries: np.ndarray, modified: bool, EMD: list,
+             memory: int) -> np.ndarray:
+    """
+    The profile `(M, N)` of the timeseries `(N, M)`, i.e., the cumulative sum
+    of the timeseries without its mean, integrated again if `modified`, and
+    detrended with the IMFs `EMD` if not `False`.
+
+    Notes
+    -----
+    .. versionadded:: 0.4.4
+    """
+
+    if isinstance(timeseries, np.memmap):
+        assert EMD is False, "EMD not available for memory-mapped timeseries"
 
-    # x-axis needed for polyfit
-    X = np.linspace(1, lag.max(), lag.max())
+        return _memmap_profile(timeseries, modified, memory)
 
-    # "Profile" of the series
-    Y = np.cumsum(timeseries - np.mean(timeseries))
+    # Accumulated in double precision for any type of the timeseries
+    mean = np.mean(timeseries, axis=0, dtype=float)
+    Y = np.cumsum(timeseries.T - mean[:, None], axis=1, dtype=float)
 
     # Cumulative "profile" for strongly anticorrelated data:
     if modified is True:
-        Y = np.cumsum(Y - np.mean(Y))
+        Y = np.cumsum(Y - np.mean(Y, axis=1, keepdims=True), axis=1)
 
-    # Return f of (fractal)-variances
-    f = np.empty((0, q.size))
+    if EMD is not False:
+        # assert the dictionary entry is a list
+        assert isinstance(EMD, list), "list IMFs to detrend"
 
-    if stat is True:
-        f_std = np.empty((0, q.size))
+        # Detrending of the timeseries using EMD with given IMFs in a list
+        Y = np.stack([detrendedtimeseries(Y_, EMD) for Y_ in Y])
 
-    # Check which extensions are requested
-    if ('eDFA', True) in extensions.items():
-        f_eDFA = np.empty((0, q.size))
+    return Y
+
+
+def _fluctuations(Y: np.ndarray, lag: np.ndarray, rows: range,
+                  orders: tuple, q: np.ndarray, stat: bool, edfa: bool,
+                  window, backend: str, memory: int, dtype: np.dtype = float,
+                  res: list = None) -> list:
+    """
+    Fluctuation functions of the profiles `Y` `(M, N)` at each lag in `lag`
+    and for each of the `orders`, written into the `rows` of the results
+    `res`, i.e., `f`, and `f_std` and `f_eDFA` if requested, with the orders
+    in the last axis. These are allocated if not given. The variances and
+    their powers are of `dtype`.
+
+    Notes
+    -----
+    .. versionadded:: 0.4.4
+    """
+
+    M, N = Y.shape
 
-    if 'EMD' in extensions:
-        if extensions['EMD'] is not False:
-            # assert the dictionary entry is a list
-            assert isinstance(extensions['EMD'], list), "list IMFs to detrend"
+    if res is None:
+        res = _allocate(_shapes(lag.size, q.size, M, stat, edfa,
+                                len(orders)))
+        rows = range(lag.size)
 
-            # Detrending of the timeseries using EMD with given IMFs in a list
-            Y = detrendedtimeseries(Y, extensions['EMD'])
+    # Out-of-core profile, the segments are read in blocks
+    if isinstance(Y, np.memmap):
+        for n, i in zip(rows, lag):
+            _blocked_fluctuation(Y, i, n, orders, q, stat, edfa, window,
+                                 memory, res, dtype)
+        return res
 
-            # Force order = 0 since the data is detrended with EMD, i.e., no
-            # need to do polynomial fittings anymore
-            order = 0
+    # Prefix sums of the segment moments, shared between lags
+    moments = {}
 
     # Loop over elements in lag
-    # Notice that given one has to split the timeseries into different
-    # segments of length 'lag', some elements at the end of the array might
-    # be missing. The same procedure is run in reverse—if not using an moving
-    # window — where elements at the beginning of the series are discarded
-    # instead.
-    for i in lag:
+    for n, i in zip(rows, lag):
 
-        # Standard option
-        if window is False:
-            # Reshape into (N/lag, lag)
-            Y_ = Y[:N - N % i].reshape((N - N % i) // i, i)
-            Y_r = Y[N % i:].reshape((N - N % i) // i, i)
+        F = _segment_variances(Y, i, orders, window, backend, memory, moments,
+                               dtype)
 
-            # If order = 0 one gets simply Fluctuation Analysis (FA), or if
-            # one is using the EMD setting the data is detrended and no
-            # polynomial fitting is needed.
-            if order == 0:
-                # Skip detrending
-                F = np.append(np.var(Y_, axis=1), np.var(Y_r, axis=1))
+        # Caculate the Multifractal (Non)-Detrended Fluctuation Analysis, and
+        # the standard deviation associated with each mean
+        mean, std = _q_moments(F, q, stat, memory)
 
-            else:
-                # Perform a polynomial fit to each segments
-                p = polyfit(X[:i], Y_.T, order)
-                p_r = polyfit(X[:i], Y_r.T, order)
+        _roots(mean, q, res[0][n])
+
+        if stat is True:
+            _roots(std, q, res[1][n])
+
+        if edfa is True:
+            res[-1][n] = eDFA(F.swapaxes(1, 2))
+
+    return res
+
+
+def _segment_variances(Y: np.ndarray, lag: int, orders: tuple, window,
+                       backend: str, memory: int, moments: dict,
+                       dtype: np.dtype = float) -> np.ndarray:
+    """
+    Detrended variances `(M, segments, orders)` of `dtype` of the segments of
+    size `lag` of the profiles `Y` `(M, N)`. The prefix sums of the
+    `'moments'` backend, and the cumulative profile of the MF-DMA backends,
+    are kept in `moments`, shared between consecutive lags.
+
+    Notice that given one has to split the timeseries into different
+    segments of length 'lag', some elements at the end of the array might be
+    missing. The same procedure is run in reverse—if not using an moving
+    window — where elements at the beginning of the series are discarded
+    instead.
+
+    Notes
+    -----
+    .. versionadded:: 0.4.4
+    """
+
+    M, N = Y.shape
+
+    # Segment variances from the prefix sums of the moments
+    if backend == 'moments':
+        F = _moment_variances(Y, lag, _segment_starts(N, lag, window),
+                              orders, moments, memory, dtype)
+
+    # Residuals of the moving average of the profile
+    elif backend in _DMA:
+        F = _dma_variances(Y, lag, window, _DMA[backend], moments)
+
+        F = np.repeat(F[..., None].astype(dtype, copy=False), len(orders),
+                      axis=-1)
+
+    # Standard option
+    elif window is False:
+        # Reshape into (M, N/lag, lag)
+        Y_ = Y[:, :N - N % lag].reshape(M, (N - N % lag) // lag, lag)
+        Y_r = Y[:, N % lag:].reshape(M, (N - N % lag) // lag, lag)
+
+        # Subtract the polynomial trend of each segment and calculate
+        # the variance
+        F = np.empty((M, 2 * Y_.shape[1], len(orders)), dtype)
+        F[:, :Y_.shape[1]] = _detrended_variances(Y_, orders, dtype)
+        F[:, Y_.shape[1]:] = _detrended_variances(Y_r, orders, dtype)
+
+    # For short timeseries, using a moving window instead of segmenting
+    # the timeseries. Notice the number of operations is considerably
+    # larger depending on the moving window displacement. The segments
+    # at every displacement are taken together from a strided view.
+    else:
+        F = _window_variances(Y, lag, _segment_starts(N, lag, window),
+                              orders, memory, dtype)
+
+    return F
+
+
+def _dma_variances(Y: np.ndarray, lag: int, window, theta: float,
+                   cache: dict) -> np.ndarray:
+    """
+    Variances `(M, segments)` of the residuals of the moving average of size
+    `lag` of the profiles `Y` `(M, N)`, over segments of size `lag`, of
+    MF-DMA. The moving average of each point is over the `(lag - 1)·(1 - θ)`
+    points before it and the `(lag - 1)·θ` points after it, rounded as in
+    [Gu2010], i.e., `θ = 0` is backward, `θ = 0.5` centred, and `θ = 1`
+    forward. Only the `N - lag + 1` points whose moving average is within
+    the series have residuals, which are segmented by `_segment_starts()`.
+    The moving averages are differences of the cumulative sum of the
+    profile, kept in `cache` for all lags, and the sums of the squared
+    residuals of the segments differences of their cumulative sum.
+
+    Notes
+    -----
+    .. versionadded:: 0.4.4
+    """
+
+    M, N = Y.shape
+
+    if 'dma' not in cache:
+        C = np.zeros((M, N + 1))
+        np.cumsum(Y, axis=1, out=C[:, 1:])
+        cache['dma'] = C
+
+    C = cache['dma']
+
+    # Points before each point in its moving average, and of residuals
+    before = int(np.ceil((lag - 1) * (1 - theta)))
+    L = N - lag + 1
+
+    E = Y[:, before:before + L] - (C[:, lag:] - C[:, :L]) / lag
+
+    S = np.zeros((M, L + 1))
+    np.cumsum(E ** 2, axis=1, out=S[:, 1:])
+
+    starts = _segment_starts(L, lag, window)
+
+    return (S[:, starts + lag] - S[:, starts]) / lag
+
+
+def _blocked_fluctuation(Y: np.ndarray, lag: int, n: int, orders: tuple,
+                         q: np.ndarray, stat: bool, edfa: bool, window,
+                         memory: int, res: list, dtype: np.dtype = float
+                         ) -> None:
+    """
+    The row `n` of the results `res` of `_fluctuations()` at `lag`, with the
+    segments read from `Y` in blocks of about `memory` bytes. The mean (and
+    standard deviation) of the powers of the variances of each block are
+    combined with the ones of the previous blocks by `_combine_moments()`,
+    such that the variances of all segments are never held at once.
+
+    Notes
+    -----
+    .. versionadded:: 0.4.4
+    """
+
+    M, N = Y.shape
+
+    # Number of segments per block, bounding also the powers of each block
+    step = max(memory // (Y.itemsize * M * max(lag, q.size * len(orders))),
+               1)
+
+    # Running number, sum, and sum of squared deviations of the powers
+    moments = [0, np.zeros((q.size, M, len(orders))),
+               np.zeros((q.size, M, len(orders)))]
+    F_max = np.full((M, len(orders)), -np.inf)
+    F_min = np.full((M, len(orders)), np.inf)
 
-                # Subtract the trend from the fit and calculate the variance
-                F = np.append(np.var(Y_ - polyval(X[:i], p), axis=1),
-                              np.var(Y_r - polyval(X[:i], p_r), axis=1)
-                              )
+    # The powers are taken relative to the reference of the first block
+    ref = None
 
-        # For short timeseries, using a moving window instead of segmenting
-        # the timeseries. Notice the number of operations is considerably
-        # larger depending on the moving window displacement.
-        if window is not False:
+    W = _windows(Y, lag)
+    for starts in _segment_blocks(N, lag, window, step):
+        F = _detrended_variances(W[:, starts], orders, dtype)
 
-            F = np.empty(0)
-            for j in range(0, i - 1, window):
+        with np.errstate(divide='ignore'):
+            logF = np.log(F)
 
-                # subtract j points as the moving window shortens the data
-                N_0 = N - j
+        if ref is None:
+            ref = _reference(logF)
 
-                # Reshape into (N_0/lag, lag)
-                Y_ = Y[j:N - N_0 % i].reshape((N - N_0 % i) // i, i)
+        logF -= ref
+        _combine_moments(moments, _powers(logF, q), stat)
 
-                # If order = 0 one gets simply Fluctuation Analysis (FA), or
-                # if one is using the EMD setting the data is detrended and
-                # no polynomial fitting is needed.
-                if order == 0:
-                    # Skip detrending
-                    F = np.append(F, np.var(Y_, axis=1))
+        if edfa is True:
+            F_max = np.maximum(F_max, np.max(F, axis=1))
+            F_min = np.minimum(F_min, np.min(F, axis=1))
 
+    mean, std = _rescale(moments, q, ref, stat)
+
+    _roots(mean, q, res[0][n])
+
+    if stat is True:
+        _roots(std, q, res[1][n])
+
+    if edfa is True:
+        res[-1][n] = F_max - F_min
+
+
+def _q_moments(F: np.ndarray, q: np.ndarray, stat: bool, memory: int
+               ) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Mean (and standard deviation if `stat`) over the segments of the powers
+    `[F²(v,s)]^{q/2}` of the variances `F` `(M, segments, orders)`, of shape
+    `(q, M, orders)`. The powers of all q-powers and segments together can
+    take hundreds of MB for small lags, thus are taken in blocks of segments
+    of about `memory` bytes and reduced by `_combine_moments()`. The
+    logarithm of the variances is taken once, and each power obtained as
+    `exp(q/2·log F)`, which is cheaper than `np.float_power()`. For `q = 0`
+    the mean (and standard deviation) is the one of `log F`, see `_roots()`.
+    The powers are taken relative to the typical variance of each series and
+    order, see `_reference()`.
+
+    Notes
+    -----
+    .. versionadded:: 0.4.4
+    """
+
+    M, S, K = F.shape
+
+    # Segments per block
+    step = max(memory // (F.itemsize * q.size * M * K), 1)
+
+    with np.errstate(divide='ignore'):
+        logF = np.log(F)
+
+    ref = _reference(logF)
+    logF -= ref
+
+    moments = [0, np.zeros((q.size, M, K)), np.zeros((q.size, M, K))]
+    for k in range(0, S, step):
+        _combine_moments(moments, _powers(logF[:, k:k + step], q), stat)
+
+    return _rescale(moments, q, ref, stat)
+
+
+def _reference(logF: np.ndarray) -> np.ndarray:
+    """
+    Mean `(M, 1, orders)` over the segments of the finite logarithms of the
+    variances `logF` `(M, segments, orders)`. The powers of the variances
+    relative to it stay close to `1`, and within the range of single
+    precision for the usual q-powers.
+
+    Notes
+    -----
+    .. versionadded:: 0.4.4
+    """
+
+    finite = np.isfinite(logF)
+
+    total = np.sum(np.where(finite, logF, 0), axis=1, keepdims=True)
+
+    return total / np.maximum(np.sum(finite, axis=1, keepdims=True), 1)
+
+
+def _rescale(moments: list, q: np.ndarray, ref: np.ndarray, stat: bool
+             ) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Mean (and standard deviation if `stat`) `(q, M, orders)` of the powers
+    of the variances, from the running `[count, total, M2]` of
+    `_combine_moments()` of the powers relative to the reference `ref` of
+    `_reference()`. For `q = 0` the reference is simply added to the mean.
+
+    Notes
+    -----
+    .. versionadded:: 0.4.4
+    """
+
+    count, total, M2 = moments
+
+    zero = q.reshape(-1) == 0
+    ref = ref[:, 0].astype(float)
+
+    scale = np.exp(q[:, :, 0] / 2 * ref)
+    scale[zero] = 1
+
+    mean = total / count * scale
+    mean[zero] += ref
+
+    return mean, (np.sqrt(M2 / count) * scale if stat is True else None)
+
+
+def _powers(logF: np.ndarray, q: np.ndarray) -> np.ndarray:
+    """
+    The powers `[F²(v,s)]^{q/2}` `(q, M, segments, orders)` from the
+    logarithm of the variances `logF` `(M, segments, orders)`, and `logF`
+    itself for `q = 0`. Zero variances, i.e., `logF = -inf`, give `0` for
+    `q > 0` and `inf` for `q < 0`, as `np.float_power()`.
+
+    Notes
+    -----
+    .. versionadded:: 0.4.4
+    """
+
+    P = logF * (q / 2).astype(logF.dtype)
+    np.exp(P, out=P)
+
+    P[q[:, 0, 0, 0] == 0] = logF
+
+    return P
+
+
+def _roots(x: np.ndarray, q: np.ndarray, out: np.ndarray = None
+           ) -> np.ndarray:
+    """
+    The fluctuation function `x^{1/q}` of the mean `x` `(q, ...)` of the
+    powers `_powers()`, and `exp(x/2)` for `q = 0`, where `x` is the mean of
+    the logarithm of the variances, written into `out` if given.
+
+    Notes
+    -----
+    .. versionadded:: 0.4.4
+    """
+
+    zero = q.reshape(-1) == 0
+    q = q.reshape((-1,) + (1,) * (x.ndim - 1))
+
+    out = np.float_power(x, 1 / np.where(q == 0, 1, q), out=out)
+    out[zero] = np.exp(x[zero] / 2)
+
+    return out
+
+
+def _combine_moments(moments: list, P: np.ndarray, stat: bool) -> None:
+    """
+    Update in place the running `[count, total, M2]` of the powers over the
+    segments with the block of powers `P` `(q, M, segments, orders)`, which
+    is overwritten if in double precision. `total` is the sum of the powers,
+    and `M2` the sum of squared deviations from their mean, only updated if
+    `stat`, both accumulated in double precision for any dtype of `P`. The
+    mean and variance of the block are combined with the ones of the
+    previous blocks as in [Chan1979], which avoids the cancellation of the
+    sum of squares.
+
+    Notes
+    -----
+    .. versionadded:: 0.4.4
+
+    References
+    ----------
+    .. [Chan1979] T. F. Chan, G. H. Golub, and R. J. LeVeque. "Updating
+        formulae and a pairwise algorithm for computing sample variances."
+        Technical Report STAN-CS-79-773, Stanford University, 1979.
+    """
+
+    count, total, M2 = moments
+    size = P.shape[2]
+
+    # The sums are in double precision regardless of the powers
+    block = np.sum(P, axis=2, dtype=float)
+
+    if stat is True:
+        # Deviations from the mean of the block, in place of the powers if
+        # these are in double precision
+        D = np.subtract(P, (block / size)[:, :, None],
+                        out=P if P.dtype == block.dtype else None)
+        M2 += np.einsum('qmsk,qmsk->qmk', D, D)
+
+        if count > 0:
+            delta = block / size - total / count
+            M2 += delta ** 2 * count * size / (count + size)
+
+    total += block
+    moments[0] = count + size
+
+
+def _segment_blocks(N: int, lag: int, window, step: int):
+    """
+    The starts of the segments of `_segment_starts()` in blocks of at most
+    `step` segments, generated without holding all starts at once.
+
+    Notes
+    -----
+    .. versionadded:: 0.4.4
+    """
+
+    if window is False:
+        offsets = [0, N % lag]
+    else:
+        offsets = range(0, lag - 1, window)
+
+    for j in offsets:
+        segments = (N - j) // lag
+        for k in range(0, segments, step):
+            yield j + np.arange(k, min(k + step, segments)) * lag
+
+
+def _memmap_profile(timeseries: np.memmap, modified: bool, memory: int
+                    ) -> np.memmap:
+    """
+    Profile `(M, N)` of the memory-mapped timeseries `(N, M)`, calculated in
+    chunks of about `memory` bytes into a memory-mapped scratch file, which
+    is removed once the profile is no longer referenced.
+
+    Notes
+    -----
+    .. versionadded:: 0.4.4
+    """
+
+    N, M = timeseries.shape
+
+    # Rows per chunk
+    step = max(memory // (8 * M), 1)
+
+    # Mean of the timeseries
+    mean = np.zeros(M)
+    for k in range(0, N, step):
+        mean += np.sum(timeseries[k:k + step], axis=0, dtype=float)
+    mean /= N
+
+    Y = np.memmap(tempfile.TemporaryFile(), dtype=float, mode='w+',
+                  shape=(M, N))
+
+    # Integrate the chunks, continuing from the end of the previous ones.
+    # The sum of the profile is kept for the second integration.
+    last = np.zeros(M)
+    total = np.zeros(M)
+    for k in range(0, N, step):
+        Y_ = last + np.cumsum(timeseries[k:k + step] - mean, axis=0)
+        Y[:, k:k + step] = Y_.T
+        last = Y_[-1]
+        total += np.sum(Y_, axis=0)
+
+    # Cumulative "profile" for strongly anticorrelated data:
+    if modified is True:
+        mean = total / N
+        last = np.zeros(M)
+        for k in range(0, N, step):
+            Y_ = last[:, None] + np.cumsum(Y[:, k:k + step] - mean[:, None],
+                                           axis=1)
+            Y[:, k:k + step] = Y_
+            last = Y_[:, -1]
+
+    Y.flush()
+
+    return Y
+
+
+def _parallel_fluctuations(Y: np.ndarray, lag: np.ndarray, args: tuple,
+                           res: list, n_jobs: int, executor) -> None:
+    """
+    `_fluctuations()` with the lags distributed over a pool of `n_jobs`
+    threads or processes, or over the given `executor`. The lags are grouped
+    into tasks (lags sharing prefix sums in the 'moments' backend stay
+    together), which are submitted from the most to the least costly, such
+    that the pool balances the load. Threads write directly into `res`, since
+    numpy releases the GIL in the heavy kernels. Processes read the profiles
+    from shared memory and return the results of their lags.
+
+    Notes
+    -----
+    .. versionadded:: 0.4.4
+    """
+
+    tasks = _tasks(Y.shape, lag, *args)
+
+    # Own pool of workers, shut down at the end, unless an Executor is given
+    with _pool(n_jobs, executor) as executor:
+        shm = None
+        try:
+            if isinstance(executor, ProcessPoolExecutor):
+                assert not isinstance(Y, np.memmap), \
+                    "Use threads for memory-mapped timeseries"
+
+                try:
+                    from multiprocessing import shared_memory
+                except ImportError:
+                    # Python < 3.8. The profiles are sent to each task
+                    futures = [executor.submit(_fluctuations, Y, lag[rows],
+                                               None, *args)
+                               for rows in tasks]
                 else:
-                    # Perform a polynomial fit to each segments
-                    p = polyfit(X[:i], Y_.T, order)
-
-                    # Subtract the trend from the fit and get the variance
-                    F = np.append(F, np.var(Y_ - polyval(X[:i], p), axis=1))
-
-        # Caculate the Multifractal (Non)-Detrended Fluctuation Analysis
-        f = np.append(f,
-                      np.float_power(
-                          np.mean(np.float_power(F, q / 2), axis=1),
-                          1 / q.T
-                      ),
-                      axis=0
-                      )
-
-        # Calculate standard deviation associated with each mean
-        if stat is True:
-            f_std = np.append(f_std,
-                              np.float_power(
-                                  np.std(np.float_power(F, q / 2), axis=1),
-                                  1 / q.T
-                              ),
-                              axis=0
-                              )
-
-        if ('eDFA', True) in extensions.items():
-            f_eDFA = np.append(f_eDFA, eDFA(F))
-
-    if stat is False:
-        if ('eDFA', True) in extensions.items():
-            return lag, f, np.vstack(f_eDFA)
+                    shm = shared_memory.SharedMemory(create=True,
+                                                     size=Y.nbytes)
+                    np.ndarray(Y.shape, Y.dtype, buffer=shm.buf)[:] = Y
+                    futures = [executor.submit(_shared_fluctuations,
+                                               shm.name, Y.shape, Y.dtype,
+                                               lag[rows], *args)
+                               for rows in tasks]
+
+                for rows, future in zip(tasks, futures):
+                    for r, r_ in zip(res, future.result()):
+                        r[rows] = r_
+
+            else:
+                futures = [executor.submit(_fluctuations, Y, lag[rows], rows,
+                                           *args, res) for rows in tasks]
+                for future in futures:
+                    future.result()
+
+        finally:
+            if shm is not None:
+                shm.close()
+                shm.unlink()
+
+
+@contextmanager
+def _pool(n_jobs: int, executor) -> Iterator[Executor]:
+    """
+    The workers over which to distribute the work: the given `executor` if
+    an `Executor`, otherwise an own pool of `n_jobs` (all CPUs for `-1`)
+    `'thread'` or `'process'` workers, shut down on exit. `None` for
+    `n_jobs = 1` without an `Executor`, i.e., to work serially.
+
+    Notes
+    -----
+    .. versionadded:: 0.4.4
+    """
+
+    if isinstance(executor, Executor):
+        yield executor
+        return
+
+    if n_jobs == 1:
+        yield None
+        return
+
+    assert executor in ('thread', 'process'), \
+        "'executor' must be 'thread', 'process', or an Executor"
+
+    if n_jobs is None or n_jobs < 1:
+        n_jobs = os.cpu_count()
+
+    if executor == 'thread':
+        pool = ThreadPoolExecutor(n_jobs)
+    else:
+        pool = ProcessPoolExecutor(n_jobs)
+
+    try:
+        yield pool
+    finally:
+        pool.shutdown()
+
+
+def _shared_fluctuations(name: str, shape: tuple, dtype: np.dtype,
+                         lag: np.ndarray, *args) -> list:
+    """
+    `_fluctuations()` in a worker process, of the profiles in the shared
+    memory block `name`.
+
+    Notes
+    -----
+    .. versionadded:: 0.4.4
+    """
+
+    from multiprocessing import shared_memory
+
+    shm = shared_memory.SharedMemory(name=name)
+    try:
+        res = _fluctuations(np.ndarray(shape, dtype, buffer=shm.buf), lag,
+                            None, *args)
+    finally:
+        shm.close()
+
+    return res
+
+
+def _tasks(shape: tuple, lag: np.ndarray, orders: tuple, q: np.ndarray,
+           stat: bool, edfa: bool, window, backend: str, memory: int,
+           dtype: np.dtype = float) -> list:
+    """
+    Split the lags into tasks, i.e., arrays of indices of `lag`, ordered from
+    the most to the least costly. The cost of a lag is estimated from its
+    number of segments, since small lags have the most, times the operations
+    per segment, i.e., the detrending and the q-powers of its variance.
+
+    Notes
+    -----
+    .. versionadded:: 0.4.4
+    """
+
+    M, N = shape
+
+    order = max(orders)
+
+    cost = np.empty(lag.size)
+    for n, i in enumerate(lag):
+        if window is False:
+            segments = 2 * (N // i)
         else:
-            return lag, f
-    if stat is True:
-        if ('eDFA', True) in extensions.items():
-            return lag, f, f_std, np.vstack(f_eDFA)
+            segments = -(-(i - 1) // window) * (N // i)
+
+        if backend == 'moments' and i >= 16 * (order + 1):
+            detrend = (order + 1) ** 2
+        elif backend in _DMA:
+            detrend = i
         else:
-            return lag, f, f_std
+            detrend = i * (order + 1)
+
+        cost[n] = M * segments * (detrend + 10 * q.size * (1 + stat)
+                                  * len(orders))
+
+    # Lags sharing the prefix sums of the moments are a single task
+    if backend == 'moments':
+        key = [_block_size(i, N) if i >= 16 * (order + 1) else -n
+               for n, i in enumerate(lag)]
+    else:
+        key = range(lag.size)
+
+    tasks = {}
+    for n, k in enumerate(key):
+        tasks.setdefault(k, []).append(n)
+
+    tasks = [np.array(rows) for rows in tasks.values()]
+
+    return sorted(tasks, key=lambda rows: -cost[rows].sum())
+
+
+def _shapes(lags: int, qs: int, M: int, stat: bool, edfa: bool,
+            orders: int = None) -> list:
+    """
+    Shapes of the results of `MFDFA()` with the timeseries in the last axis,
+    i.e., `f`, and `f_std` and `f_eDFA` if requested, followed by the axis of
+    `orders` if given.
+
+    Notes
+    -----
+    .. versionadded:: 0.4.4
+    """
+
+    shapes = [(lags, qs, M)]
+
+    if stat is True:
+        shapes.append((lags, qs, M))
+
+    if edfa is True:
+        shapes.append((lags, M))
+
+    if orders is not None:
+        shapes = [shape + (orders,) for shape in shapes]
+
+    return shapes
+
+
+def _allocate(shapes: list, out: Tuple[np.ndarray, ...] = None) -> list:
+    """
+    Allocate the arrays of the given `shapes` for the results, or check that
+    the arrays in `out` given by the caller match them.
+
+    Notes
+    -----
+    .. versionadded:: 0.4.4
+    """
+
+    if out is None:
+        return [np.empty(shape) for shape in shapes]
+
+    if len(out) != len(shapes):
+        raise ValueError(
+            "'out' needs {} arrays, one per result.".format(len(shapes))
+        )
+
+    for o, shape in zip(out, shapes):
+        if o.shape != shape:
+            raise ValueError(
+                "'out' array of shape {}, expected {}.".format(o.shape, shape)
+            )
+
+    return list(out)
+
+
+def _MFDFA_list(timeseries: list, lag: np.ndarray, order: int, q: np.ndarray,
+                stat: bool, modified: bool, extensions: dict, backend: str,
+                out: Tuple[np.ndarray, ...] = None, memory: int = 2 ** 27,
+                n_jobs: int = 1, executor='thread', dtype: np.dtype = float
+                ) -> Tuple[np.ndarray, ...]:
+    """
+    `MFDFA()` of a list of timeseries of possibly different lengths. The
+    timeseries of equal length are stacked and analysed in a single call, and
+    the results of each group placed at the position of its timeseries along
+    the last axis.
+
+    Notes
+    -----
+    .. versionadded:: 0.4.4
+    """
+
+    # Group the timeseries by length
+    groups = {}
+    for m, X in enumerate(timeseries):
+        X = np.asarray(X).reshape(-1)
+        groups.setdefault(X.size, []).append((m, X))
+
+    if isinstance(out, np.ndarray):
+        out = (out,)
+
+    # Axis of the timeseries in the results, before the axis of the orders
+    axis = -1 if np.ndim(order) == 0 else -2
+
+    res = None
+    for group in groups.values():
+        idx = [m for m, _ in group]
+        res_ = _MFDFA(np.stack([X for _, X in group], axis=1), lag, order, q,
+                      stat, modified, extensions, backend, None, memory,
+                      n_jobs, executor, dtype)
+
+        # Allocate the results with all the timeseries in the last axis
+        if res is None:
+            shapes = [list(r.shape) for r in res_[1:]]
+            for shape in shapes:
+                shape[axis] = len(timeseries)
+            res = _allocate([tuple(shape) for shape in shapes], out)
+
+        for r, r_ in zip(res, res_[1:]):
+            np.moveaxis(r, axis, -1)[..., idx] = np.moveaxis(r_, axis, -1)
+
+    return (res_[0],) + tuple(res)
+
+
+def _detrended_variance(Y_: np.ndarray, order: int) -> np.ndarray:
+    """
+    Variance of each segment (last axis) of `Y_` after subtracting its
+    least-square polynomial fit of order `order`. The fit is not solved per
+    segment: the residuals are obtained by projecting all segments at once
+    onto the orthogonal complement of the polynomial basis given by
+    `_projector()`.
+
+    If `order = 0` one gets simply Fluctuation Analysis (FA), or if one is
+    using the EMD setting the data is detrended and no polynomial fitting is
+    needed.
+
+    Notes
+    -----
+    .. versionadded:: 0.4.4
+    """
+
+    if order == 0:
+        return np.var(Y_, axis=-1)
+
+    Q = _projector(Y_.shape[-1], order)
+
+    # Residuals of the fit. These have zero mean, since the constant is part
+    # of the basis, thus the variance is simply the mean of the squares
+    R = Y_ - (Y_ @ Q) @ Q.T
+
+    return np.einsum('...i,...i->...', R, R) / Y_.shape[-1]
+
+
+def _detrended_variances(Y_: np.ndarray, orders: tuple,
+                          dtype: np.dtype = float) -> np.ndarray:
+    """
+    `_detrended_variance()` of each segment (last axis) of `Y_` for each of
+    the `orders`, in a new last axis. The segments are projected once onto
+    the basis of the highest order. Since the basis is nested, the residuals
+    of a lower order `k` are the ones of the highest order plus the
+    projections onto the basis vectors of degree `> k`, which are orthogonal,
+    thus its variance follows by adding their squares.
+
+    For a `dtype` other than the one of `Y_` the segments are rounded to
+    `dtype` by `_rounded_segments()`. The segments whose residuals are not
+    well above the rounding of their values, e.g., of smooth profiles or of
+    lags of a few points more than the order, are recalculated in the
+    precision of `Y_`, see `_ROUNDING`.
+
+    Notes
+    -----
+    .. versionadded:: 0.4.4
+    """
+
+    if Y_.dtype != dtype:
+        D, scale = _rounded_segments(Y_, min(orders) > 0, dtype)
+        V = _detrended_variances(D, orders, dtype)
+
+        # Variances not well above the rounding of the values of the segment
+        floor = (_ROUNDING * np.finfo(dtype).eps * scale) ** 2
+        low = np.any(V < floor[..., None], axis=-1)
+        if np.any(low):
+            V[low] = _detrended_variances(Y_[low], orders, Y_.dtype)
+
+        return V
+
+    order = max(orders)
+
+    if order == 0:
+        return np.repeat(np.var(Y_, axis=-1)[..., None], len(orders), axis=-1)
+
+    Q = _projector(Y_.shape[-1], order, Y_.dtype)
+
+    C = Y_ @ Q
+    R = Y_ - C @ Q.T
+
+    # Variance of the residuals of each degree k, the squared projections
+    # onto the degrees > k are accumulated from the highest degree down
+    V = np.empty(C.shape, C.dtype)
+    V[..., -1] = np.einsum('...i,...i->...', R, R)
+    V[..., -2::-1] = V[..., -1:] + np.cumsum(C[..., :0:-1] ** 2, axis=-1)
+
+    return V[..., list(orders)] / Y_.shape[-1]
+
+
+def _rounded_segments(Y_: np.ndarray, chord: bool, dtype: np.dtype
+                      ) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    The segments `(M, segments, lag)` of `Y_` rounded to `dtype`, after
+    subtracting their first value, and the chord between their ends if
+    `chord`, and the root mean square `(M, segments)` of each, the scale of
+    their rounding. The chord is linear, thus part of the fit of any order
+    `≥ 1`, and leaves the detrended variances unchanged, but the rounding is
+    then relative to the fluctuations of each segment and not to its offset
+    and slope, which grow with the size of the series. The subtraction is
+    performed in blocks of segments small enough to stay in the cache.
+
+    Notes
+    -----
+    .. versionadded:: 0.4.4
+    """
+
+    M, S, lag = Y_.shape
+
+    out = np.empty(Y_.shape, dtype)
+    scale = np.empty((M, S))
+
+    t = np.linspace(0, 1, lag)
+
+    # Segments per block of about 1 MB
+    step = max(2 ** 17 // (M * lag), 1)
+
+    for k in range(0, S, step):
+        D = Y_[:, k:k + step] - Y_[:, k:k + step, :1]
+        if chord is True:
+            D -= D[..., -1:] * t
+        out[:, k:k + step] = D
+        scale[:, k:k + step] = np.einsum('...i,...i->...', D, D)
+
+    np.sqrt(scale / lag, out=scale)
+
+    return out, scale
+
+
+@lru_cache(maxsize=256)
+def _projector(lag: int, order: int, dtype: np.dtype = float
+               ) -> np.ndarray:
+    """
+    Orthonormal basis `(lag, order + 1)` of the polynomials up to degree
+    `order` sampled over a segment of size `lag`. The least-square fit of a
+    segment `y` is `Q @ (Q.T @ y)`, such that the design matrix, which only
+    depends on `(lag, order)`, is factorised once and cached. The basis is
+    obtained in double precision and rounded to `dtype`, the one of the
+    segments.
+
+    Notes
+    -----
+    .. versionadded:: 0.4.4
+    """
+
+    # Abscissa rescaled to [-1, 1] to keep the Vandermonde matrix well
+    # conditioned for higher orders
+    X = np.linspace(-1, 1, lag)
+
+    # The QR decomposition yields a nested orthonormal basis, i.e., the first
+    # k + 1 columns span the polynomials up to degree k
+    Q, _ = np.linalg.qr(np.vander(X, order + 1, increasing=True))
+    Q = Q.astype(dtype, copy=False)
+
+    # The cached array is shared between calls
+    Q.flags.writeable = False
+
+    return Q
+
+
+def _segment_starts(N: int, lag: int, window) -> np.ndarray:
+    """
+    First index of each segment of size `lag` of a series of length `N`. In
+    the standard option the segmentation is performed from the beginning and
+    from the end of the series, with a moving `window` the segmentation is
+    repeated with the series shifted by every `window` steps.
+
+    Notes
+    -----
+    .. versionadded:: 0.4.4
+    """
+
+    if window is False:
+        starts = np.arange(N // lag) * lag
+        return np.concatenate([starts, starts + N % lag])
+
+    return np.concatenate([j + np.arange((N - j) // lag) * lag
+                           for j in range(0, lag - 1, window)])
+
+
+def _moment_variances(Y: np.ndarray, lag: int, starts: np.ndarray,
+                      orders: tuple, cache: dict, memory: int = 2 ** 27,
+                      dtype: np.dtype = float) -> np.ndarray:
+    """
+    Detrended variance `(M, segments, orders)` of the segments of size `lag`
+    starting at `starts` of each profile in `Y`, obtained in `O(1)` per
+    segment from the prefix sums of `_prefix_moments()`. With the local
+    abscissa `x` of `_projector()`, the moments `Σxᵏ·Y` of each segment give
+    the projections `c` onto the orthonormal basis, and the residual sum of
+    squares is simply `ΣY² - |c|²`, or of the first `k + 1` entries of `c`
+    for each lower order `k`.
+
+    The prefix sums depend only on the block size, thus are kept in `cache`
+    while consecutive lags share it. Lags `< 16·(order + 1)`, with `order`
+    the highest of `orders`, are projected directly, as are the segments
+    whose residuals are lost in the cancellation of the sums, see
+    `_CANCELLATION`. The sums are taken in double precision, and the
+    variances rounded to `dtype`.
+
+    Notes
+    -----
+    .. versionadded:: 0.4.4
+    """
+
+    # Short segments are many, and gathering and projecting them is cheaper.
+    # Moreover, few degrees of freedom left after the fit can give residuals
+    # close to zero, which the difference of sums cannot resolve.
+    order = max(orders)
+
+    if lag < 16 * (order + 1):
+        return _window_variances(Y, lag, starts, orders, memory, dtype)
+
+    M, N = Y.shape
+
+    B = _block_size(lag, N)
+
+    # The trend of the blocks must not exceed the lowest order
+    if B not in cache:
+        cache.clear()
+        cache[B] = _prefix_moments(Y, B, order, min(orders))
+
+    P = cache[B]
+
+    # Sums over each segment relative to the beginning of its block, and the
+    # sum of squares of the whole block
+    b, o = np.divmod(starts, B)
+    idx = b * P.shape[3] + o
+    T = P[-1][:, b, -1]
+    L = P.shape[3] - 1
+    P = P.reshape(order + 2, M, -1)
+    G = P[:, :, idx + lag] - P[:, :, idx]
+
+    # Change the abscissa to the [-1, 1] interval of each segment, i.e.,
+    # t = d + h·x, by a binomial expansion of the moments
+    h = (lag - 1) / 2
+    d = [np.ones(starts.size), -(o + h)]
+    for k in range(2, order + 1):
+        d.append(d[-1] * d[1])
+
+    S = np.zeros((order + 1, M, starts.size))
+    binom = [1.]
+    for k in range(order + 1):
+        for l in range(k + 1):
+            S[k] += (binom[l] / h ** k) * d[k - l] * G[l]
+        binom = [1.] + [binom[l] + binom[l + 1] for l in range(k)] + [1.]
+
+    # Projections onto the orthonormal basis Q = V·R⁻¹, i.e., c = R⁻ᵀ·Vᵀ·Y
+    Q = _projector(lag, order)
+    R = Q.T @ np.vander(np.linspace(-1, 1, lag), order + 1, increasing=True)
+    c = np.tensordot(np.linalg.inv(R).T, S, axes=1)
+
+    # Residual sum of squares of each degree, since the basis is nested
+    V = G[-1] - np.cumsum(c ** 2, axis=0)
+
+    # The difference cancels the rounding of the prefix sums, which grows
+    # with the sum of squares of the block, its length, and the shift of the
+    # abscissa. Segments whose residuals are not well above it, e.g., of
+    # smooth profiles, are projected directly
+    E = np.sqrt(L) * ((h - d[1]) / h) ** order * T
+    low = V[list(orders)] < _CANCELLATION * np.finfo(float).eps * E
+    low = np.any(low, axis=(0, 1))
+
+    V = np.moveaxis(V[list(orders)], 0, -1) / lag
+    if np.any(low):
+        V[:, low] = _window_variances(Y, lag, starts[low], orders, memory)
+
+    return V.astype(dtype, copy=False)
+
+
+def _block_size(lag: int, N: int) -> int:
+    """
+    Size of the blocks of the prefix sums of `_prefix_moments()` for segments
+    of size `lag`. Blocks of 4 to 16 times the lag, up to the size of the
+    series `N`, such that lags within a factor 4 of each other share the
+    prefix sums.
+
+    Notes
+    -----
+    .. versionadded:: 0.4.4
+    """
+
+    return min(int(4 ** np.ceil(np.log(4 * lag) / np.log(4))), N)
+
+
+def _prefix_moments(Y: np.ndarray, B: int, order: int, trend: int = None
+                    ) -> np.ndarray:
+    """
+    Prefix sums `(order + 2, M, blocks, L + 1)` of the moments `tᵏ·Y` for
+    `k = 0, ..., order`, and of `Y²` in the last entry, over overlapping
+    blocks of size `L = 2B` starting every `B` points. Any segment of size
+    `≤ B` is hence contained in the block where it starts, and the sums are
+    taken relative to the beginning of each block, after subtracting a
+    polynomial trend of order `trend` (by default `order`) from each block,
+    which leaves the detrended variance of the segments unchanged for any
+    order `≥ trend`. This avoids the loss of precision of prefix sums over
+    the whole series.
+
+    Notes
+    -----
+    .. versionadded:: 0.4.4
+    """
+
+    M, N = Y.shape
+
+    # Number of blocks and size of each block
+    n = -(-N // B)
+    L = 2 * B if n > 1 else B
+
+    # Zero-padded blocks (views of Y_). Padding is never part of a segment
+    Y_ = np.zeros((M, (n - 1) * B + L))
+    Y_[:, :N] = Y
+    Z = _windows(Y_, L)[:, ::B]
+
+    # Remove the trend of each block. The blocks can be as long as the
+    # series, thus their basis is not kept in the cache of `_projector()`
+    if trend is None:
+        trend = order
+
+    Q = _projector.__wrapped__(L, trend)
+    Z = Z - (Z @ Q) @ Q.T
+
+    t = np.arange(L)
+
+    P = np.zeros((order + 2, M, n, L + 1))
+    np.cumsum(Z ** 2, axis=2, out=P[-1, :, :, 1:])
+    for k in range(order + 1):
+        np.cumsum(Z, axis=2, out=P[k, :, :, 1:])
+        Z *= t
+
+    return P
+
+
+def _window_variances(Y: np.ndarray, lag: int, starts: np.ndarray,
+                      orders: tuple, memory: int = 2 ** 27,
+                      dtype: np.dtype = float) -> np.ndarray:
+    """
+    Detrended variance `(M, segments, orders)` of `dtype` of the segments of
+    size `lag` starting at `starts` of each profile in `Y`, which may
+    overlap. The segments are gathered from a strided view of `Y` in blocks
+    of about `memory` bytes, since all overlapping segments together take
+    `N·lag` entries.
+
+    Notes
+    -----
+    .. versionadded:: 0.4.4
+    """
+
+    M = Y.shape[0]
+
+    F = np.empty((M, starts.size, len(orders)), dtype)
+
+    # Number of segments per block
+    step = max(memory // (Y.itemsize * M * lag), 1)
+
+    W = _windows(Y, lag)
+    for k in range(0, starts.size, step):
+        F[:, k:k + step] = _detrended_variances(W[:, starts[k:k + step]],
+                                                orders, dtype)
+
+    return F
+
+
+def _windows(Y: np.ndarray, lag: int) -> np.ndarray:
+    """
+    Read-only view `(M, N - lag + 1, lag)` of all the segments of size `lag`
+    of each series in `Y` `(M, N)`, i.e., `sliding_window_view(Y, lag, 1)` of
+    `numpy.lib.stride_tricks`, which is not available in older versions of
+    numpy.
+
+    Notes
+    -----
+    .. versionadded:: 0.4.4
+    """
+
+    return as_strided(Y, shape=(Y.shape[0], Y.shape[1] - lag + 1, lag),
+                      strides=(Y.strides[0], Y.strides[1], Y.strides[1]),
+                      writeable=False)
 
 
 def eDFA(F: np.ndarray) -> np.ndarray:
@@ -291,12 +1816,13 @@ def eDFA(F: np.ndarray) -> np.ndarray:
     Parameters
     ----------
     F: np.ndarray
-        Fluctuation function given by the `MFDFA()`.
+        Fluctuation function given by the `MFDFA()`. For several timeseries,
+        an array `(M, segments)`.
 
     Returns
     -------
     res: np.ndarray
-        Difference of `max` and `min`.
+        Difference of `max` and `min`, one per timeseries.
 
     Notes
     -----
@@ -310,6 +1836,4 @@ def eDFA(F: np.ndarray) -> np.ndarray:
         peripheral arterial pressure in rats." CNSNS 85, 105232, 2020
     """
 
-    return np.max(F) - np.min(F)
-
-# TODO: Add log calculator for q ≈ 0
+    return np.max(F, axis=-1) - np.min(F, axis=-1)
@@ -1,5 +1,11 @@
-from .MFDFA import MFDFA
-from .fgn import fgn
+from .MFDFA import MFDFA, MFDFAResult, Profile
+from .streaming import StreamingMFDFA
+from .bootstrap import bootstrap
+from .surrogates import surrogates, significance
+from .mfdxa import MFDXA
+from .local import local_hurst
+from .mfdfa2d import MFDFA2D
+from .fgn import fgn, fgn_chunks
 from .emddetrender import detrendedtimeseries, IMFs
 from . import singspect
 
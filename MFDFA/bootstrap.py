@@ -0,0 +1,261 @@
+# This is based on Kantelhardt, J. W., Zschiegner, S. A., Koscielny-Bunde, E.,
+# Havlin, S., Bunde, A., & Stanley, H. E., Multifractal detrended fluctuation
+# analysis of nonstationary time series. Physica A, 316(1-4), 87-114, 2002 and
+# on Efron, B., & Tibshirani, R. J., An Introduction to the Bootstrap. Chapman
+# & Hall, 1993.
+
+from typing import NamedTuple
+
+import numpy as np
+from .MFDFA import Profile, _pool, _powers, _q_moments, _roots, \
+    _segment_variances
+from .singspect import Spectrum, spectrum
+
+__all__ = [
+    'Bootstrap',
+    'bootstrap'
+]
+
+
+class Bootstrap(NamedTuple):
+    """
+    The results of `bootstrap()`.
+
+    Attributes
+    ----------
+    lag: np.ndarray of ints
+        Array of lags, filtered as in `MFDFA()`.
+
+    f: np.ndarray
+        The fluctuation function `(lags, q)` of `MFDFA()`.
+
+    f_boot: np.ndarray
+        The fluctuation function of each replicate `(lags, q, n_boot)`.
+
+    spectrum: Spectrum
+        The spectrum of `singspect.spectrum()` of `f`.
+
+    replicates: Spectrum
+        The spectrum of each replicate, i.e., of `f_boot`, with the
+        replicates in the last axis.
+
+    low: Spectrum
+        The lower bound of the confidence interval of each entry of the
+        spectrum.
+
+    high: Spectrum
+        The upper bound of the confidence interval of each entry of the
+        spectrum.
+
+    Notes
+    -----
+    For several timeseries, the timeseries are in the axis before the one of
+    the replicates, as in `MFDFA()`.
+
+    .. versionadded:: 0.4.4
+    """
+
+    lag: np.ndarray
+    f: np.ndarray
+    f_boot: np.ndarray
+    spectrum: Spectrum
+    replicates: Spectrum
+    low: Spectrum
+    high: Spectrum
+
+
+def bootstrap(timeseries: np.ndarray, lag: np.ndarray, order: int = 1,
+              q: np.ndarray = 2, modified: bool = False,
+              extensions: dict = {'EMD': False, 'window': False},
+              backend: str = 'projection', n_boot: int = 1000,
+              ci: float = 0.95, lim: list = [False, False], seed=None,
+              memory: int = 2 ** 27, n_jobs: int = 1, executor='process'
+              ) -> Bootstrap:
+    """
+    Bootstrap confidence intervals of the generalised Hurst exponents `h(q)`
+    and of the singularity spectrum `f(α)`. The detrended variances
+    `F²(v,s)` of the segments of each lag are calculated once, as in
+    `MFDFA()`, and each replicate resamples these segments with replacement.
+    The fluctuation function of a replicate is then a weighted average of the
+    q-powers of the variances, i.e., no segment is detrended again, and the
+    replicates of each lag are obtained together as a single matrix product.
+
+    Parameters
+    ----------
+    timeseries: np.ndarray
+        A 1-dimensional timeseries `(N, 1)`, or a stack of timeseries of
+        equal length `(N, M)`, or a `Profile`.
+
+    lag: np.ndarray of ints
+        An array with the window sizes to calculate (ints), see `MFDFA()`.
+
+    order: int (default `1`)
+        The order of the polynomials to approximate, see `MFDFA()`.
+
+    q: np.ndarray (default `2`)
+        Fractal exponent to calculate. Must be more than 2 points for the
+        singularity spectrum.
+
+    modified: bool (default `False`)
+        Second integration of the timeseries, see `MFDFA()`.
+
+    extensions: dict
+        The `EMD` and `window` extensions of `MFDFA()`. With a moving
+        `window` the overlapping segments are resampled.
+
+    backend: str (default `'projection'`)
+        How the detrended variance of each segment is obtained, see
+        `MFDFA()`.
+
+    n_boot: int (default `1000`)
+        Number of bootstrap replicates.
+
+    ci: float (default `0.95`)
+        Confidence level of the percentile intervals `low` and `high`.
+
+    lim: list (default `[int(lag.size // 1.5), int(lag.size // 8)]`)
+        List of lower and upper lag limits of the fits, see
+        `singspect.spectrum()`.
+
+    seed: int or np.random.SeedSequence (default `None`)
+        Seed of the replicates. Each lag draws its replicates from its own
+        stream, spawned from `seed`, thus the results are reproducible
+        regardless of `n_jobs`.
+
+    memory: int (default `2 ** 27`, i.e., 128 MB)
+        Approximate limit in bytes of the resampling counts drawn at once.
+
+    n_jobs: int (default `1`)
+        Number of workers over which the lags are distributed. Use `-1` for
+        as many workers as CPUs.
+
+    executor: str or concurrent.futures.Executor (default `'process'`)
+        The workers of `n_jobs`, `'process'` or `'thread'`, or an existing
+        `Executor`, see `MFDFA()`.
+
+    Returns
+    -------
+    res: Bootstrap
+        Named tuple with the fields `lag`, `f`, `f_boot`, `spectrum`,
+        `replicates`, `low`, and `high`.
+
+    Examples
+    --------
+    >>> res = bootstrap(X, lag, q = q, n_boot = 500, seed = 42)
+    >>> plt.fill_between(res.spectrum.q, res.low.hq, res.high.hq)
+
+    Notes
+    -----
+    The segments of a lag are assumed exchangeable, i.e., the replicates do
+    not keep the correlations between neighbouring segments.
+
+    .. versionadded:: 0.4.4
+
+    References
+    ----------
+    .. [Efron1993] B. Efron and R. J. Tibshirani. "An Introduction to the
+        Bootstrap." Chapman & Hall, 1993.
+    """
+
+    assert 0 < ci < 1, "'ci' must be in (0, 1)"
+
+    # Force lag to be ints, ensure lag > order + 1
+    lag = lag[lag > order + 1]
+    lag = np.round(lag).astype(int)
+
+    # Assert if window is given, that it is int and > 0
+    window = extensions.get('window', False)
+    if window is not False:
+        assert isinstance(window, int), "'window' is not integer"
+        assert window > 0, "'window' is not > 0"
+
+    # Fractal powers as floats. q = 0 is the logarithmic average
+    q = np.asarray_chkfinite(q, dtype=float).reshape(-1, 1, 1, 1)
+
+    # The preprocessing, as in MFDFA()
+    if not isinstance(timeseries, Profile):
+        timeseries = Profile(timeseries, modified,
+                             extensions.get('EMD', False), memory)
+
+    Y = timeseries.Y
+
+    # Force order = 0 if the data is detrended with EMD
+    orders = (0,) if timeseries.EMD is not False else (order,)
+
+    # Independent streams of each lag
+    seeds = np.random.SeedSequence(seed).spawn(lag.size)
+
+    f = np.empty((lag.size, q.size, Y.shape[0]))
+    f_boot = np.empty((lag.size, q.size, Y.shape[0], n_boot))
+
+    # Own pool of workers, shut down at the end, or None to work serially
+    moments = {}
+    with _pool(n_jobs, executor) as executor:
+        futures = []
+        for n, i in enumerate(lag):
+            F = _segment_variances(Y, i, orders, window, backend, memory,
+                                   moments)
+
+            f[n] = _roots(_q_moments(F, q, False, memory)[0], q)[..., 0]
+
+            # Replicates resampling the variances of the segments
+            if executor is not None:
+                futures.append(executor.submit(_resample, F[..., 0], q,
+                                               n_boot, seeds[n], memory))
+            else:
+                f_boot[n] = _resample(F[..., 0], q, n_boot, seeds[n], memory)
+
+        for n, future in enumerate(futures):
+            f_boot[n] = future.result()
+
+    # A single timeseries returns the results without its axis
+    if timeseries.single is True:
+        f, f_boot = f[:, :, 0], f_boot[:, :, 0]
+
+    q = q.reshape(-1)
+
+    # Spectrum of the fluctuation function and of each replicate
+    point = spectrum(lag, f, q, lim)
+    replicates = spectrum(lag, f_boot, q, lim)
+
+    low, high = (Spectrum(q, *bound) for bound in zip(*[
+        np.percentile(r, [50 * (1 - ci), 50 * (1 + ci)], axis=-1)
+        for r in replicates[1:]
+    ]))
+
+    return Bootstrap(lag, f, f_boot, point, replicates, low, high)
+
+
+def _resample(F: np.ndarray, q: np.ndarray, n_boot: int,
+              seed: np.random.SeedSequence, memory: int) -> np.ndarray:
+    """
+    Fluctuation functions `(q, M, n_boot)` of `n_boot` replicates of the
+    variances `F` `(M, segments)` of the segments of a lag. Each replicate
+    draws the number of times each segment is taken, such that its average
+    of the q-powers is a product of these counts with the q-powers of all
+    segments. The counts of the replicates are drawn in blocks of about
+    `memory` bytes.
+
+    Notes
+    -----
+    .. versionadded:: 0.4.4
+    """
+
+    S = F.shape[1]
+
+    rng = np.random.default_rng(seed)
+
+    with np.errstate(divide='ignore'):
+        P = _powers(np.log(F)[..., None], q)[..., 0]
+
+    mean = np.empty(P.shape[:2] + (n_boot,))
+
+    # Replicates per block
+    step = max(memory // (8 * S), 1)
+
+    for b in range(0, n_boot, step):
+        counts = rng.multinomial(S, np.full(S, 1 / S),
+                                 size=min(step, n_boot - b))
+        mean[..., b:b + step] = P @ counts.T / S
+
+    return _roots(mean, q)
@@ -2,20 +2,32 @@
 # https://github.com/crflynn/fbm and Davies, Robert B., and D. S. Harte. “Tests
 # for Hurst effect.” Biometrika 74, no. 1 (1987): 95-101.
 
+import warnings
+from functools import lru_cache
+from typing import Iterator, Tuple
+
 import numpy as np
 
 __all__ = [
     'fgn',
+    'fgn_chunks',
 ]
 
+# Largest size for which the Davies–Harte method falls back to Hosking's
+# method, of O(N²), without it being requested explicitly
+_FALLBACK = 2 ** 13
+
 
-def fgn(N: int, H: float) -> np.ndarray:
+def fgn(N: int, H: float, n_paths: int = None, seed=None,
+        method: str = 'daviesharte', dtype: np.dtype = float) -> np.ndarray:
     """
     Generates fractional Gaussian noise with a Hurst index H in (0,1). If
     H = 1/2 this is simply Gaussian noise.
-    The current method employed is the Davies–Harte method, which fails for
-    H ≈ 0. A Cholesky decomposition method and the Hosking’s method will be
-    implemented in later versions.
+    The default method employed is the Davies–Harte method, which is exact
+    if the circulant embedding of the correlation function has non-negative
+    eigenvalues, which they are for fractional Gaussian noise. Should these
+    not be, Hosking's method is employed instead, with a warning, for N up
+    to `2 ** 13`.
 
     Parameters
     ----------
@@ -25,57 +37,403 @@ def fgn(N: int, H: float) -> np.ndarray:
     H: float
         Hurst exponent H in (0,1).
 
+    n_paths: int (default `None`)
+        Number of independent paths to generate. These are obtained together
+        from a single (real) FFT of shape `(2N, n_paths)`.
+
+    seed: int or np.random.Generator (default `None`)
+        Seed, or generator, of the random numbers. If `None`, the global
+        `np.random` state is used, as in previous versions.
+
+    method: str (default `'daviesharte'`)
+     - `'daviesharte'`: The Davies–Harte method, of `O(N log N)`.
+     - `'cholesky'`: Product of the Cholesky factor of the covariance matrix
+        with white noise. Exact for any H, but the factor takes `N²` entries,
+        thus only for short N.
+     - `'hosking'`: Hosking's method, i.e., each entry is drawn conditioned
+        on all the previous ones, of `O(N²)`. Exact for any H.
+
+    dtype: np.dtype (default `float`)
+        Floating-point type of the noise, e.g., `np.float32` to halve its
+        memory. The normal distributed noises are drawn in double precision,
+        thus a seed gives the same paths for any `dtype` up to rounding. The
+        FFT of the Davies–Harte method is then performed in `dtype` (for
+        numpy ≥ 2.0), the other methods in double precision.
+
     Returns
     -------
     f: np.ndarray
         A array of size N of fractional Gaussian noise with a Hurst index H.
+        If `n_paths` is given, of shape `(N, n_paths)`, i.e., ready to be
+        given to `MFDFA()`.
+
+    Notes
+    -----
+    The eigenvalues of the circulant embedding, the Cholesky factor, and the
+    reflection coefficients of the Durbin–Levinson recursion of Hosking's
+    method only depend on `(N, H)`, thus are cached, such that generating
+    many paths with repeated calls does not compute them again.
+
+    The circulant embedding of the Davies–Harte method is the one of the
+    correlations at lags `0, ..., N`, i.e., of size `2N`, whose eigenvalues
+    are non-negative for any H. These are only found negative for
+    correlations not accurate enough, hence the correlations are calculated
+    avoiding the cancellation of large powers of the lags. For negative
+    eigenvalues, the Davies–Harte method falls back to Hosking's method with
+    a `RuntimeWarning`. Since Hosking's method is of `O(N²)`, i.e., about a
+    second for `N = 2·10⁴` and an hour for `N = 10⁶`, N larger than
+    `2 ** 13` raise a `ValueError` instead, and `method = 'hosking'` has to
+    be given explicitly.
+
+    .. versionchanged:: 0.4.4
+        Added `n_paths`, `seed`, `method`, and `dtype`. The Davies–Harte
+        method falls back to Hosking's method for negative eigenvalues.
+
+    References
+    ----------
+    .. [Davies1987] R. B. Davies and D. S. Harte. "Tests for Hurst effect."
+        Biometrika, 74(1), 95–101, 1987.
+    .. [Hosking1984] J. R. M. Hosking. "Modeling persistence in hydrological
+        time series using fractional differencing." Water Resources Research,
+        20(12), 1898–1908, 1984.
     """
 
     # Asserts
     assert isinstance(N, int), "Size must be an integer number"
     assert isinstance(H, float), "Hurst index must be a float in (0,1)"
+    assert method in ('daviesharte', 'cholesky', 'hosking'), \
+        "'method' must be 'daviesharte', 'cholesky', or 'hosking'"
 
-    # Generate linspace
-    k = np.linspace(0, N - 1, N)
+    K = 1 if n_paths is None else n_paths
+
+    # Normal distributed noises
+    if seed is None:
+        normal = np.random.normal
+    else:
+        normal = np.random.default_rng(seed).normal
 
-    # Correlation function
-    cor = 0.5 * (abs(k - 1) ** (2 * H)
-                 - 2 * abs(k) ** (2 * H)
-                 + abs(k + 1) ** (2 * H)
-                 )
-
-    # Eigenvalues of the correlation function
-    eigenvals = \
-        np.sqrt(
-            np.fft.fft(
-                np.real(
-                    np.concatenate(
-                        [cor[:], 0, cor[1:][::-1]], axis=None
-                    )
+    # Square root of the eigenvalues of the correlation function. The method
+    # is not exact if any is negative.
+    if method == 'daviesharte':
+        eigenvals = _eigenvalues(N, H)
+        if eigenvals is None:
+            if N > _FALLBACK:
+                raise ValueError(
+                    "The circulant embedding has negative eigenvalues for "
+                    "H = {}, and Hosking's method is of O(N²). Use "
+                    "method = 'hosking' explicitly.".format(H)
                 )
+            warnings.warn(
+                "The circulant embedding has negative eigenvalues for "
+                "H = {}, falling back to Hosking's method, of O(N²)."
+                .format(H), RuntimeWarning
             )
-        )
+            method = 'hosking'
+
+    if method == 'daviesharte':
+        f = _davies_harte(eigenvals.astype(dtype),
+                          normal(0.0, 1.0, (N, K)).astype(dtype),
+                          normal(0.0, 1.0, (N, K)).astype(dtype))
+
+    elif method == 'cholesky':
+        f = _cholesky(N, H) @ normal(0.0, 1.0, (N, K))
+
+    else:
+        f = _hosking(N, H, normal(0.0, 1.0, (N, K)))
+
+    # Older versions of numpy perform the FFT in double precision
+    f = f.astype(dtype, copy=False)
+    f *= (1.0 / N) ** H
+
+    return f[:, 0] if n_paths is None else f
+
+
+def fgn_chunks(N: int, H: float, chunk: int = 2 ** 20, lags: int = 2 ** 15,
+               seed=None, out: np.ndarray = None) -> Iterator[np.ndarray]:
+    """
+    Generates fractional Gaussian noise of size N in chunks, with memory
+    bounded by the size of a chunk, such that paths larger than the memory
+    can be generated, e.g., into a `np.memmap`. The noise is white noise
+    filtered with the square root of the circulant embedding of the
+    correlation function up to `lags`, i.e., a moving average, applied to
+    each chunk by FFT convolution with the white noise of the previous
+    `2·lags` entries (overlap-save).
+
+    Parameters
+    ----------
+    N: int
+        Size of fractional Gaussian noise to generate.
+
+    H: float
+        Hurst exponent H in (0,1).
 
-    # Two normal distributed noises to be convoluted
-    gn = np.random.normal(0.0, 1.0, N)
-    gn2 = np.random.normal(0.0, 1.0, N)
+    chunk: int (default `2 ** 20`)
+        Size of each generated chunk, except the last one.
 
-    # This is the Davies–Harte method
+    lags: int (default `2 ** 15`)
+        Half the length of the filter. The correlations are accurate for lags
+        much smaller than `lags`, e.g., to ~1e-3 up to `lags / 100`, see
+        Notes.
 
+    seed: int or np.random.Generator (default `None`)
+        Seed, or generator, of the random numbers. If `None`, the global
+        `np.random` state is used. The noise does not depend on `chunk`.
+
+    out: np.ndarray (default `None`)
+        Array of size `N`, e.g., a `np.memmap`, into which each chunk is
+        written as it is generated. The chunks yielded are then views of
+        `out`.
+
+    Yields
+    ------
+    f: np.ndarray
+        The next chunk of fractional Gaussian noise, scaled as `fgn()`.
+
+    Examples
+    --------
+    >>> X = np.lib.format.open_memmap('fgn.npy', mode='w+', shape=(10**9,))
+    >>> for _ in fgn_chunks(10**9, 0.7, out = X):
+    ...     pass
+
+    Notes
+    -----
+    Unlike `fgn()`, the noise is not exact: the filter is truncated, thus
+    the correlations decay faster than the ones of fractional Gaussian noise
+    at lags comparable to `lags`, e.g., by 1% at `lags / 4` for H = 0.7, and
+    by 4% for H = 0.9. Increase `lags` for longer-ranged correlations.
+
+    .. versionadded:: 0.4.4
+    """
+
+    # Asserts
+    assert isinstance(N, int), "Size must be an integer number"
+    assert isinstance(H, float), "Hurst index must be a float in (0,1)"
+
+    # Normal distributed noises
+    if seed is None:
+        normal = np.random.normal
+    else:
+        normal = np.random.default_rng(seed).normal
+
+    g = _filter(lags, H)
+
+    # Size of the FFT of each chunk, with the noise of the previous entries
+    n = chunk + g.size - 1
+    G = np.fft.rfft(g, n) * (1.0 / N) ** H
+
+    z = normal(0.0, 1.0, g.size - 1)
+    for k in range(0, N, chunk):
+        c = min(chunk, N - k)
+
+        # White noise of the chunk, and of the entries the filter reaches
+        z = np.concatenate([z[z.size - g.size + 1:], normal(0.0, 1.0, c)])
+
+        # Only the entries without wrap-around of the convolution are kept
+        f = np.fft.irfft(np.fft.rfft(z, n) * G, n)[g.size - 1:g.size - 1 + c]
+
+        if out is not None:
+            out[k:k + c] = f
+            f = out[k:k + c]
+
+        yield f
+
+
+def _davies_harte(eigenvals: np.ndarray, gn: np.ndarray, gn2: np.ndarray
+                  ) -> np.ndarray:
+    """
+    Fractional Gaussian noise `(N, K)` with the Davies–Harte method, with
+    the square root of the eigenvalues `(2N,)` of the circulant embedding of
+    the correlation function, and two normal distributed noises `(N, K)` to
+    be convoluted.
+
+    Notes
+    -----
+    .. versionadded:: 0.4.4
+    """
+
+    N = gn.shape[0]
+    eigenvals = eigenvals[:, None]
+
+    # The sequence w is Hermitian, i.e., its second half is the conjugate of
+    # the first, thus only the first N + 1 entries are formed, and the FFT of
+    # size 2N is a real one
     w = np.concatenate(
         [
-            (eigenvals[0] / np.sqrt(2 * N)) * gn[0],
+            (eigenvals[:1] / np.sqrt(2 * N)) * gn[:1],
             (eigenvals[1:N] / np.sqrt(4 * N)) * (gn[1:] + 1j * gn2[1:]),
-            (eigenvals[N] / np.sqrt(2 * N)) * gn2[0],
-            (eigenvals[N + 1:] / np.sqrt(4 * N))
-            * (gn[1:][:: - 1] - 1j * gn2[1:][:: - 1])
-        ], axis=None)
+            (eigenvals[N:N + 1] / np.sqrt(2 * N)) * gn2[:1],
+        ], axis=0)
 
     # Perform fft. Only first N entry are useful
-    f = np.fft.fft(w).real[:N] * ((1.0 / N) ** H)
+    return np.fft.hfft(w, n=2 * N, axis=0)[:N]
+
+
+def _hosking(N: int, H: float, gn: np.ndarray) -> np.ndarray:
+    """
+    Fractional Gaussian noise `(N, K)` with Hosking's method from the normal
+    distributed noise `gn` `(N, K)`. Each entry is the prediction from all
+    the previous ones plus the innovation of its conditional variance. The
+    coefficients of the prediction of each entry follow from the ones of the
+    previous entry and the cached reflection coefficients, thus only need
+    `O(N)` memory.
+
+    Notes
+    -----
+    .. versionadded:: 0.4.4
+    """
+
+    reflection, sigma = _durbin_levinson(N, H)
+
+    f = np.empty(gn.shape)
+    f[0] = sigma[0] * gn[0]
+
+    # Coefficients of the prediction from the previous entries, latest first
+    phi = np.zeros(N)
+    for n in range(1, N):
+        k = reflection[n]
+        phi[:n - 1] -= k * phi[:n - 1][::-1].copy()
+        phi[n - 1] = k
+
+        f[n] = phi[:n] @ f[n - 1::-1] + sigma[n] * gn[n]
 
-    # TODO: Check for further speed-ups
-    # TODO: Generalise for several outputs. Should be straightforward.
-    # TODO: Implement the Cholesky decomposition method
-    # TODO: Implement the Hosking’s method
     return f
+
+
+def _autocovariance(N: int, H: float) -> np.ndarray:
+    """
+    Autocovariance `(N,)` of fractional Gaussian noise with unit variance and
+    Hurst index `H`, at lags `0, ..., N - 1`.
+
+    Notes
+    -----
+    .. versionadded:: 0.4.4
+    """
+
+    # Generate linspace
+    k = np.linspace(0, N - 1, N)
+
+    # Correlation function, as k^2H [(1 + 1/k)^2H - 2 + (1 - 1/k)^2H] / 2,
+    # since the difference of the powers of large k loses all the digits of
+    # the correlation for H close to 1
+    cor = np.ones(N)
+    with np.errstate(divide='ignore'):
+        x = 1 / k[1:]
+        cor[1:] = 0.5 * k[1:] ** (2 * H) * (np.expm1(2 * H * np.log1p(x))
+                                            + np.expm1(2 * H * np.log1p(-x)))
+
+    return cor
+
+
+@lru_cache(maxsize=4)
+def _cholesky(N: int, H: float) -> np.ndarray:
+    """
+    Lower Cholesky factor `(N, N)` of the covariance matrix of fractional
+    Gaussian noise of size `N` and Hurst index `H`.
+
+    Notes
+    -----
+    .. versionadded:: 0.4.4
+    """
+
+    cor = _autocovariance(N, H)
+
+    k = np.arange(N)
+    L = np.linalg.cholesky(cor[abs(k[:, None] - k[None, :])])
+
+    # The cached array is shared between calls
+    L.flags.writeable = False
+
+    return L
+
+
+@lru_cache(maxsize=16)
+def _durbin_levinson(N: int, H: float) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Reflection coefficients `(N,)` of the Durbin–Levinson recursion of the
+    autocovariance of fractional Gaussian noise, and the standard deviation
+    `(N,)` of each entry conditioned on the previous ones.
+
+    Notes
+    -----
+    .. versionadded:: 0.4.4
+    """
+
+    cor = _autocovariance(N, H)
+
+    reflection = np.zeros(N)
+    variance = np.empty(N)
+    variance[0] = cor[0]
+
+    phi = np.zeros(N)
+    for n in range(1, N):
+        k = (cor[n] - phi[:n - 1] @ cor[n - 1:0:-1]) / variance[n - 1]
+        phi[:n - 1] -= k * phi[:n - 1][::-1].copy()
+        phi[n - 1] = k
+
+        reflection[n] = k
+        variance[n] = variance[n - 1] * (1 - k ** 2)
+
+    sigma = np.sqrt(variance)
+
+    # The cached arrays are shared between calls
+    reflection.flags.writeable = False
+    sigma.flags.writeable = False
+
+    return reflection, sigma
+
+
+@lru_cache(maxsize=16)
+def _filter(lags: int, H: float) -> np.ndarray:
+    """
+    Filter `(2·lags,)` of `fgn_chunks()`, i.e., the symmetric square root of
+    the circulant embedding of the correlation function of fractional
+    Gaussian noise up to `lags`, such that its autocorrelation is the
+    correlation function. The embedding includes the correlation at `lags`,
+    and has non-negative eigenvalues for any H.
+
+    Notes
+    -----
+    .. versionadded:: 0.4.4
+    """
+
+    cor = _autocovariance(lags + 1, H)
+
+    eigenvals = np.fft.fft(np.concatenate([cor, cor[1:-1][::-1]])).real
+
+    # Centred filter. Rounding can give tiny negative eigenvalues
+    g = np.fft.fftshift(np.fft.ifft(np.sqrt(np.maximum(eigenvals, 0))).real)
+
+    # The cached array is shared between calls
+    g.flags.writeable = False
+
+    return g
+
+
+@lru_cache(maxsize=16)
+def _eigenvalues(N: int, H: float) -> np.ndarray:
+    """
+    Square root of the eigenvalues `(2N,)` of the circulant embedding of the
+    correlation function of fractional Gaussian noise of size `N` and Hurst
+    index `H`, or `None` if any eigenvalue is negative.
+
+    Notes
+    -----
+    .. versionadded:: 0.4.4
+    """
+
+    cor = _autocovariance(N + 1, H)
+
+    # Eigenvalues of the circulant embedding of the correlations at lags
+    # 0, ..., N, ..., 1
+    eigenvals = np.fft.fft(np.concatenate([cor, cor[1:-1][::-1]]))
+
+    # The eigenvalues of a symmetric embedding are real up to rounding
+    if np.any(eigenvals.real < 0):
+        return None
+
+    eigenvals = np.sqrt(eigenvals.real)
+
+    # The cached array is shared between calls
+    eigenvals.flags.writeable = False
+
+    return eigenvals
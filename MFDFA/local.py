@@ -0,0 +1,203 @@
+# This is based on Kantelhardt, J. W., Zschiegner, S. A., Koscielny-Bunde, E.,
+# Havlin, S., Bunde, A., & Stanley, H. E., Multifractal detrended fluctuation
+# analysis of nonstationary time series. Physica A, 316(1-4), 87-114, 2002,
+# and on Carbone, A., Castelli, G., & Stanley, H. E., Time-dependent Hurst
+# exponent in financial time series. Physica A, 344(1-2), 267-271, 2004.
+
+from typing import NamedTuple
+
+import numpy as np
+from .MFDFA import Profile, _detrended_variances, _moment_variances, \
+    _powers, _reference, _rescale, _roots
+from .singspect import hurst_exponents
+
+__all__ = [
+    'LocalHurst',
+    'local_hurst'
+]
+
+
+class LocalHurst(NamedTuple):
+    """
+    The results of `local_hurst()`.
+
+    Attributes
+    ----------
+    time: np.ndarray
+        Centre of each analysis window.
+
+    lag: np.ndarray of ints
+        Array of lags, filtered as in `MFDFA()` and to at most half the
+        analysis window.
+
+    f: np.ndarray
+        The fluctuation function of each analysis window `(lags, q, time)`.
+
+    hq: np.ndarray
+        The generalised Hurst exponents of each analysis window `(time, q)`.
+
+    Notes
+    -----
+    For several timeseries, the timeseries are in an additional last axis,
+    as in `MFDFA()`.
+
+    .. versionadded:: 0.4.4
+    """
+
+    time: np.ndarray
+    lag: np.ndarray
+    f: np.ndarray
+    hq: np.ndarray
+
+
+def local_hurst(timeseries: np.ndarray, lag: np.ndarray, window: int,
+                q: np.ndarray = 2, order: int = 1, step: int = None,
+                modified: bool = False, lim: list = [False, False],
+                backend: str = 'projection', memory: int = 2 ** 27
+                ) -> LocalHurst:
+    """
+    Time-resolved generalised Hurst exponents `h(q)`, i.e., the ones of
+    `MFDFA()` of each analysis window of size `window` sliding over the
+    timeseries by `step`. The timeseries is segmented once at each lag, from
+    its beginning, and the detrended variances `F²(v,s)` of all segments are
+    obtained once, as in `MFDFA()`. The mean of their q-powers over the
+    segments within each analysis window then follows from the difference of
+    their cumulative sums, such that all windows together cost as much as a
+    single analysis of the whole timeseries.
+
+    Parameters
+    ----------
+    timeseries: np.ndarray
+        A 1-dimensional timeseries `(N, 1)`, or a stack of timeseries of
+        equal length `(N, M)`, or a `Profile`.
+
+    lag: np.ndarray of ints
+        An array with the window sizes to calculate (ints), see `MFDFA()`.
+        Only the lags of at most `window // 2` are kept, such that each
+        analysis window contains at least one segment of each lag.
+
+    window: int
+        Size of the analysis windows.
+
+    q: np.ndarray (default `2`)
+        Fractal exponent to calculate. As in `MFDFA()`, `q = 0` gives the
+        logarithmic average.
+
+    order: int (default `1`)
+        The order of the polynomials to approximate, see `MFDFA()`.
+
+    step: int (default `window // 8`)
+        Displacement between consecutive analysis windows.
+
+    modified: bool (default `False`)
+        Second integration of the timeseries, see `MFDFA()`.
+
+    lim: list (default `[int(lag.size // 1.5), int(lag.size // 8)]`)
+        List of lower and upper lag limits of the fits, see
+        `singspect.hurst_exponents()`.
+
+    backend: str (default `'projection'`)
+        How the detrended variance of each segment is obtained, see
+        `MFDFA()`.
+
+    memory: int (default `2 ** 27`, i.e., 128 MB)
+        Approximate limit in bytes of the segments copied at once, see
+        `MFDFA()`.
+
+    Returns
+    -------
+    res: LocalHurst
+        Named tuple with the fields `time`, `lag`, `f`, and `hq`.
+
+    Examples
+    --------
+    >>> res = local_hurst(X, lag, window = 4096, q = q)
+    >>> plt.pcolormesh(res.time, q, res.hq.T)
+
+    Notes
+    -----
+    The segments of each analysis window are the ones of the segmentation of
+    the whole timeseries that lie within it, thus not segmented from the
+    beginning and from the end of the window as `MFDFA()` of the window. The
+    profile is the one of the whole timeseries, which differs from the one
+    of each window by a linear trend, removed by any `order ≥ 1`.
+
+    .. versionadded:: 0.4.4
+
+    References
+    ----------
+    .. [Carbone2004] A. Carbone, G. Castelli, and H. E. Stanley.
+        "Time-dependent Hurst exponent in financial time series." Physica A,
+        344(1-2), 267–271, 2004.
+    """
+
+    assert isinstance(window, int), "'window' is not integer"
+    assert window > 0, "'window' is not > 0"
+    assert backend in ('projection', 'moments'), \
+        "'backend' must be 'projection' or 'moments'"
+
+    # Force lag to be ints, ensure order + 1 < lag <= window / 2
+    lag = lag[(lag > order + 1) & (lag <= window // 2)]
+    lag = np.round(lag).astype(int)
+
+    # Fractal powers as floats. q = 0 is the logarithmic average
+    q = np.asarray_chkfinite(q, dtype=float).reshape(-1, 1, 1, 1)
+
+    if step is None:
+        step = max(window // 8, 1)
+
+    # The preprocessing, as in MFDFA()
+    if not isinstance(timeseries, Profile):
+        timeseries = Profile(timeseries, modified, False, memory)
+
+    Y = timeseries.Y
+
+    # Force order = 0 if the data is detrended with EMD
+    orders = (0,) if timeseries.EMD is not False else (order,)
+
+    M, N = Y.shape
+
+    assert window <= N, "'window' is larger than the timeseries"
+
+    # Beginning and end of each analysis window
+    begins = np.arange(0, N - window + 1, step)
+    ends = begins + window
+
+    f = np.empty((lag.size, q.size, M, begins.size))
+
+    moments = {}
+    for n, i in enumerate(lag):
+        S = N // i
+
+        if backend == 'moments':
+            F = _moment_variances(Y, i, np.arange(S) * i, orders, moments,
+                                  memory)
+        else:
+            F = _detrended_variances(Y[:, :S * i].reshape(M, S, i), orders)
+
+        with np.errstate(divide='ignore'):
+            logF = np.log(F)
+
+        ref = _reference(logF)
+        logF -= ref
+
+        # Cumulative sums of the powers over the segments, (q, M, S + 1)
+        C = np.zeros((q.size, M, S + 1, 1))
+        np.cumsum(_powers(logF, q), axis=2, out=C[:, :, 1:])
+
+        # Segments [a, b) within each analysis window
+        a, b = -(-begins // i), ends // i
+
+        mean, _ = _rescale([b - a, C[:, :, b, 0] - C[:, :, a, 0], None], q,
+                           ref, False)
+
+        _roots(mean, q, f[n])
+
+    # The windows in the axis after q, before the one of the timeseries
+    f = np.moveaxis(f, 2, -1)
+    if timeseries.single is True:
+        f = f[..., 0]
+
+    _, hq = hurst_exponents(lag, f, q.reshape(-1), lim)
+
+    return LocalHurst(begins + window / 2, lag, f, np.swapaxes(hq, 0, 1))
@@ -0,0 +1,209 @@
+# This is based on Gu, G.-F., & Zhou, W.-X., Detrended fluctuation analysis
+# for fractals and multifractals in higher dimensions. Phys. Rev. E, 74(6),
+# 061104, 2006.
+
+from functools import lru_cache
+from typing import Tuple
+
+import numpy as np
+from .MFDFA import _q_moments, _roots
+
+__all__ = [
+    'MFDFA2D'
+]
+
+
+def MFDFA2D(surface: np.ndarray, lag: np.ndarray, order: int = 1,
+            q: np.ndarray = 2, stat: bool = False, memory: int = 2 ** 27
+            ) -> Tuple[np.ndarray, ...]:
+    """
+    Two-dimensional Multifractal Detrended Fluctuation Analysis of a surface
+    `X`, e.g., a height map or an image. The surface is partitioned into
+    tiles of size `s×s`, and the cumulative sum of each tile
+
+    .. math::
+
+       u_{v,w}(i,j) = \\sum_{k=1}^i \\sum_{l=1}^j X_{(v-1)s + k, (w-1)s + l}
+
+    is detrended with a bivariate polynomial of order m, the one of its
+    least-square fit. The variance of the residuals gives :math:`F^2(v,w,s)`
+    and the fluctuation function follows as in `MFDFA()`, averaging the
+    `q/2`-powers over all tiles. The fits are not solved per tile: all tiles
+    of the same size are projected at once onto the orthogonal complement
+    of a cached orthonormal basis of the bivariate polynomials.
+
+    Parameters
+    ----------
+    surface: np.ndarray
+        A 2-dimensional array `(N₁, N₂)`.
+
+    lag: np.ndarray of ints
+        An array with the tile sizes `s` to calculate (ints). Notice
+        `min(lag) > order + 1`, and that the results are meaningless for
+        tiles larger than a quarter of the surface.
+
+    order: int (default `1`)
+        The total degree of the bivariate polynomials to approximate, e.g.,
+        `order = 1` fits the plane `a + b·i + c·j`, and `order = 2` adds
+        `i²`, `i·j`, and `j²`. `order = 0` subtracts the mean of each tile.
+
+    q: np.ndarray (default `2`)
+        Fractal exponent to calculate. As in `MFDFA()`, `q = 0` gives the
+        logarithmic average.
+
+    stat: bool (default `False`)
+        Calculates the standard deviation associated with each tile's
+        averaging.
+
+    memory: int (default `2 ** 27`, i.e., 128 MB)
+        Approximate limit in bytes of the tiles copied at once, at most 4 MB,
+        and of their q-powers. The tiles of each size are taken in blocks of
+        rows of tiles.
+
+    Returns
+    -------
+    lag: np.ndarray of ints
+        Array of tile sizes, realigned, preserving only different sizes and
+        with entries > order + 1
+
+    f: np.ndarray
+        A array of shape `(size(lag),size(q))` of variances over the
+        indicated tile sizes and the indicated q-fractal powers, as the one
+        of `MFDFA()`, thus can be given to the functions of `singspect`.
+
+    f_std: np.ndarray
+        If `stat = True`, the standard deviation associated with each mean,
+        of the same shape as `f`.
+
+    Examples
+    --------
+    >>> lag = np.unique(np.logspace(1, 3, 20).astype(int))
+    >>> lag, f = MFDFA2D(image, lag, q = q)
+    >>> q, hq = singspect.hurst_exponents(lag, f, q)
+
+    Notes
+    -----
+    The surface is partitioned from its first row and column, and the last
+    rows and columns not filling a tile of size `s` are discarded. The mean
+    of the surface is removed, as the one of the timeseries in `MFDFA()`,
+    since a mean `μ` adds `μ·i·j` to the cumulative sum of every tile, which
+    the plane of `order = 1` does not fit. The cumulative sums are taken in
+    each tile, as in [Gu2006], thus the generalised Hurst exponent of a
+    surface of white noise is `h(q) = 1`.
+
+    .. versionadded:: 0.4.4
+
+    References
+    ----------
+    .. [Gu2006] G.-F. Gu and W.-X. Zhou. "Detrended fluctuation analysis for
+        fractals and multifractals in higher dimensions." Phys. Rev. E,
+        74(6), 061104, 2006.
+    """
+
+    surface = np.asarray_chkfinite(surface, dtype=float)
+
+    # Assert if surface is 2 dimensional
+    assert surface.ndim == 2, "Surface needs to be of shape (N1, N2)"
+
+    # Force lag to be ints, ensure order + 1 < lag <= the size of the surface
+    lag = lag[(lag > order + 1) & (lag <= min(surface.shape))]
+    lag = np.round(lag).astype(int)
+
+    # Fractal powers as floats. q = 0 is the logarithmic average
+    q = np.asarray_chkfinite(q, dtype=float).reshape(-1, 1, 1, 1)
+
+    # The mean is subtracted from each block of tiles, not copying the
+    # whole surface
+    mu = np.mean(surface)
+
+    f = np.empty((lag.size, q.size))
+    if stat is True:
+        f_std = np.empty((lag.size, q.size))
+
+    # Loop over elements in lag
+    for n, s in enumerate(lag):
+        F = _tile_variances(surface, mu, s, order, memory)
+
+        mean, std = _q_moments(F[None, :, None], q, stat, memory)
+
+        f[n] = _roots(mean, q)[:, 0, 0]
+        if stat is True:
+            f_std[n] = _roots(std, q)[:, 0, 0]
+
+    if stat is True:
+        return lag, f, f_std
+
+    return lag, f
+
+
+def _tile_variances(surface: np.ndarray, mu: float, lag: int, order: int,
+                    memory: int) -> np.ndarray:
+    """
+    Detrended variances `(tiles,)` of the cumulative sums of the tiles of
+    size `lag × lag` of the surface, less its mean `mu`, in row-major order of
+    the tiles. Each block of rows of tiles is reshaped into tiles
+    `(tiles, lag²)`, summed cumulatively along both axes, and projected onto
+    the orthogonal complement of the basis of `_projector2d()`.
+
+    Notes
+    -----
+    .. versionadded:: 0.4.4
+    """
+
+    a, b = surface.shape[0] // lag, surface.shape[1] // lag
+
+    Q = _projector2d(lag, order)
+
+    F = np.empty(a * b)
+
+    # Rows of tiles per block. Blocks of a few MB are faster, since the
+    # cumulative sums and the residuals are then mostly in the cache
+    step = max(min(memory, 2 ** 22) // (8 * b * lag * lag), 1)
+
+    for r in range(0, a, step):
+        rows = min(step, a - r)
+
+        T = surface[r * lag:(r + rows) * lag, :b * lag]
+        T = T.reshape(rows, lag, b, lag).swapaxes(1, 2)
+
+        # Cumulative sum of each tile, flattened
+        U = np.subtract(T, mu, order='C')
+        np.cumsum(U, axis=2, out=U)
+        np.cumsum(U, axis=3, out=U)
+        U = U.reshape(rows * b, -1)
+
+        # Residuals of the fit, in place of the cumulative sums
+        U -= (U @ Q) @ Q.T
+
+        F[r * b:(r + rows) * b] = np.einsum('ij,ij->i', U, U) / lag ** 2
+
+    return F
+
+
+@lru_cache(maxsize=256)
+def _projector2d(lag: int, order: int) -> np.ndarray:
+    """
+    Orthonormal basis `(lag², terms)` of the bivariate polynomials of total
+    degree up to `order` sampled over a tile of size `lag × lag`, flattened
+    in row-major order, as `_projector()` of `MFDFA` for a segment.
+
+    Notes
+    -----
+    .. versionadded:: 0.4.4
+    """
+
+    # Abscissas rescaled to [-1, 1] to keep the design matrix well
+    # conditioned for higher orders
+    x = np.linspace(-1, 1, lag)
+    i, j = np.meshgrid(x, x, indexing='ij')
+    i, j = i.reshape(-1), j.reshape(-1)
+
+    V = np.stack([i ** k * j ** (d - k) for d in range(order + 1)
+                  for k in range(d + 1)], axis=1)
+
+    Q, _ = np.linalg.qr(V)
+
+    # The cached array is shared between calls
+    Q.flags.writeable = False
+
+    return Q
@@ -0,0 +1,255 @@
+# This is based on Zhou, W.-X., Multifractal detrended cross-correlation
+# analysis for two nonstationary signals. Phys. Rev. E, 77(6), 066211, 2008,
+# on Podobnik, B., & Stanley, H. E., Detrended cross-correlation analysis: a
+# new method for analyzing two nonstationary time series. Phys. Rev. Lett.,
+# 100(8), 084102, 2008, and on Zebende, G. F., DCCA cross-correlation
+# coefficient: Quantifying level of cross-correlation. Physica A, 390(4),
+# 614-618, 2011.
+
+import os
+from typing import Tuple
+
+import numpy as np
+from .MFDFA import Profile, _combine_moments, _powers, _profile, \
+    _projector, _reference, _rescale, _roots, _segment_blocks, _windows
+
+__all__ = [
+    'MFDXA'
+]
+
+
+def MFDXA(timeseries: np.ndarray, lag: np.ndarray, order: int = 1,
+          q: np.ndarray = 2, stat: bool = False, modified: bool = False,
+          rho: bool = False, memory: int = 2 ** 27
+          ) -> Tuple[np.ndarray, ...]:
+    """
+    Multifractal Detrended Cross-Correlation Analysis of every pair of a set
+    of timeseries. The profiles are segmented and detrended as in `MFDFA()`,
+    and the detrended covariance of the timeseries `x` and `y` in each
+    segment is
+
+    .. math::
+
+       F^2_{xy}(v,s) = \\dfrac{1}{s} \\sum_{i=1}^s [X_{(v-1)s + i} - x_{v,i}]
+       [Y_{(v-1)s + i} - y_{v,i}],
+
+    with :math:`x_{v,i}` and :math:`y_{v,i}` the polynomial fittings of order
+    m. The fluctuation function is then
+
+    .. math::
+
+       F_q(s) = \\Bigg\\{\\dfrac{1}{N_s} \\sum_{v=1}^{N_s}
+       |F^2_{xy}(v,s)|^{q/2}\\Bigg\\}^{1/q},
+
+    which for `x = y` is the one of `MFDFA()`. The residuals of each segment
+    are obtained once per timeseries, and the covariances of all pairs
+    follow from a single product of the residuals of the segment, i.e.,
+    `M` timeseries are detrended `M` times and not `M²`.
+
+    Parameters
+    ----------
+    timeseries: np.ndarray
+        A stack of timeseries of equal length `(N, M)`, or a list of `M`
+        1-dimensional timeseries of equal length, e.g., `[x, y]`. Also a
+        `Profile`, a `np.memmap`, or the path to a `.npy` file, see
+        `MFDFA()`.
+
+    lag: np.ndarray of ints
+        An array with the window sizes to calculate (ints), see `MFDFA()`.
+
+    order: int (default `1`)
+        The order of the polynomials to approximate, see `MFDFA()`.
+
+    q: np.ndarray (default `2`)
+        Fractal exponent to calculate. As in `MFDFA()`, `q = 0` gives the
+        logarithmic average.
+
+    stat: bool (default `False`)
+        Calculates the standard deviation associated with each segment's
+        averaging.
+
+    modified: bool (default `False`)
+        Second integration of the timeseries, see `MFDFA()`.
+
+    rho: bool (default `False`)
+        Calculates the detrended cross-correlation coefficient of each pair,
+        i.e., the mean detrended covariance normalised by the mean detrended
+        variances, in `[-1, 1]` [Zebende2011].
+
+    memory: int (default `2 ** 27`, i.e., 128 MB)
+        Approximate limit in bytes of the residuals, and of the powers of the
+        covariances, of the segments taken at once.
+
+    Returns
+    -------
+    lag: np.ndarray of ints
+        Array of lags, realigned, preserving only different lags and with
+        entries > order + 1
+
+    f: np.ndarray
+        A array of shape `(size(lag),size(q),M,M)` of the fluctuation
+        functions of each pair of timeseries, symmetric in the last two axes,
+        whose diagonal is `MFDFA()` of each timeseries. For two timeseries,
+        `f[:, :, 0, 1]` is their cross-correlation fluctuation function.
+
+    f_std: np.ndarray
+        If `stat = True`, the standard deviation associated with each mean,
+        of the same shape as `f`.
+
+    rho: np.ndarray
+        If `rho = True`, the detrended cross-correlation coefficients of
+        shape `(size(lag),M,M)`.
+
+    Examples
+    --------
+    >>> lag, f = MFDFA.MFDXA([x, y], lag, q = q)
+    >>> hxy = singspect.hurst_exponents(lag, f[:, :, 0, 1], q)
+
+    Notes
+    -----
+    .. versionadded:: 0.4.4
+
+    References
+    ----------
+    .. [Podobnik2008] B. Podobnik and H. E. Stanley. "Detrended
+        cross-correlation analysis: a new method for analyzing two
+        nonstationary time series." Phys. Rev. Lett., 100(8), 084102, 2008.
+    .. [Zhou2008] W.-X. Zhou. "Multifractal detrended cross-correlation
+        analysis for two nonstationary signals." Phys. Rev. E, 77(6),
+        066211, 2008.
+    .. [Zebende2011] G. F. Zebende. "DCCA cross-correlation coefficient:
+        Quantifying level of cross-correlation." Physica A, 390(4), 614–618,
+        2011.
+    """
+
+    # Force lag to be ints, ensure lag > order + 1
+    lag = lag[lag > order + 1]
+    lag = np.round(lag).astype(int)
+
+    # Fractal powers as floats. q = 0 is the logarithmic average
+    q = np.asarray_chkfinite(q, dtype=float).reshape(-1, 1, 1, 1)
+
+    # A prepared profile is analysed as is, and carries its own detrending
+    if isinstance(timeseries, Profile):
+        Y = timeseries.Y
+        if timeseries.EMD is not False:
+            order = 0
+
+    else:
+        if isinstance(timeseries, (list, tuple)):
+            timeseries = np.stack(
+                [np.asarray(X).reshape(-1) for X in timeseries], axis=1
+            )
+        # Timeseries stored in a .npy file are memory-mapped
+        elif isinstance(timeseries, (str, os.PathLike)):
+            timeseries = np.load(timeseries, mmap_mode='r')
+
+        # Assert if timeseries is a stack of timeseries
+        assert timeseries.ndim <= 2, "Timeseries needs to be of shape (N, M)"
+
+        Y = _profile(timeseries.reshape(timeseries.shape[0], -1), modified,
+                     False, memory)
+
+    M = Y.shape[0]
+
+    # Each pair once, i.e., the upper triangle of the matrices
+    a, b = np.triu_indices(M)
+
+    f = np.empty((lag.size, q.size, M, M))
+    if stat is True:
+        f_std = np.empty((lag.size, q.size, M, M))
+    if rho is True:
+        r = np.empty((lag.size, M, M))
+
+    # Loop over elements in lag
+    for n, i in enumerate(lag):
+        mean, std, cov = _cross_moments(Y, i, order, q, stat, memory, a, b)
+
+        f[n][:, a, b] = f[n][:, b, a] = _roots(mean, q)
+        if stat is True:
+            f_std[n][:, a, b] = f_std[n][:, b, a] = _roots(std, q)
+
+        if rho is True:
+            r[n][a, b] = r[n][b, a] = cov
+            var = np.sqrt(np.diagonal(r[n]).copy())
+            r[n] /= var[:, None] * var[None, :]
+
+    res = (lag, f)
+    if stat is True:
+        res += (f_std,)
+    if rho is True:
+        res += (r,)
+
+    return res
+
+
+def _cross_moments(Y: np.ndarray, lag: int, order: int, q: np.ndarray,
+                   stat: bool, memory: int, a: np.ndarray, b: np.ndarray
+                   ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Mean (and standard deviation if `stat`) `(q, pairs)` over the segments
+    of size `lag` of the powers `|F²_xy(v,s)|^{q/2}` of the detrended
+    covariances of the pairs `(a, b)` of the profiles `Y` `(M, N)`, and the
+    mean detrended covariance `(pairs,)`. The segments are taken in blocks
+    of about `memory` bytes, whose powers are combined by
+    `_combine_moments()`.
+
+    Notes
+    -----
+    .. versionadded:: 0.4.4
+    """
+
+    M, N = Y.shape
+
+    # Segments per block, bounding the residuals and the powers
+    step = max(memory // (Y.itemsize * max(M * lag, q.size * a.size)), 1)
+
+    moments = [0, np.zeros((q.size, a.size, 1)),
+               np.zeros((q.size, a.size, 1))]
+    cov = np.zeros(a.size)
+
+    # The powers are taken relative to the reference of the first block
+    ref = None
+
+    W = _windows(Y, lag)
+    for starts in _segment_blocks(N, lag, False, step):
+        R = _residuals(W[:, starts], order)
+
+        # Covariances of all pairs in each segment, (pairs, segments, 1)
+        C = np.matmul(R.transpose(1, 0, 2), R.transpose(1, 2, 0)) / lag
+        C = C[:, a, b].T[..., None]
+
+        cov += np.sum(C[..., 0], axis=1)
+
+        with np.errstate(divide='ignore'):
+            logF = np.log(np.abs(C))
+
+        if ref is None:
+            ref = _reference(logF)
+
+        logF -= ref
+        _combine_moments(moments, _powers(logF, q), stat)
+
+    mean, std = _rescale(moments, q, ref, stat)
+
+    return mean[..., 0], (std[..., 0] if stat is True else None), \
+        cov / moments[0]
+
+
+def _residuals(Y_: np.ndarray, order: int) -> np.ndarray:
+    """
+    Residuals of each segment (last axis) of `Y_` after subtracting its
+    least-square polynomial fit of order `order`, see `_detrended_variance()`
+    of `MFDFA`.
+
+    Notes
+    -----
+    .. versionadded:: 0.4.4
+    """
+
+    if order == 0:
+        return Y_ - np.mean(Y_, axis=-1, keepdims=True)
+
+    Q = _projector(Y_.shape[-1], order, Y_.dtype)
+
+    return Y_ - (Y_ @ Q) @ Q.T
@@ -5,12 +5,13 @@
 # F. Ihlen, Introduction to multifractal detrended fluctuation analysis in
 # Matlab, Front. Physiol., 2012, https://doi.org/10.3389/fphys.2012.00141
 
-from typing import Tuple
+from typing import NamedTuple, Tuple
 
 import numpy as np
-from numpy.polynomial.polynomial import polyfit
 
 __all__ = [
+    'Spectrum',
+    'spectrum',
     'singularity_spectrum',
     'scaling_exponents',
     'hurst_exponents',
@@ -20,6 +21,92 @@ __all__ = [
 ]
 
 
+class Spectrum(NamedTuple):
+    """
+    The multifractal spectrum of `spectrum()`, i.e., the generalised Hurst
+    exponents `h(q)`, the scaling exponents `τ(q)`, the singularity strength
+    `α`, and the singularity spectrum `f(α)`, all from a single fit of the
+    fluctuation function.
+
+    Notes
+    -----
+    .. versionadded:: 0.4.4
+    """
+
+    q: np.ndarray
+    hq: np.ndarray
+    tau: np.ndarray
+    alpha: np.ndarray
+    f: np.ndarray
+
+
+def spectrum(lag: np.array, mfdfa: np.ndarray, q: np.array,
+             lim: list = [False, False], interpolate: int = False
+             ) -> Spectrum:
+    """
+    Extract the slopes of the fluctuation function once, and obtain from them
+    the generalised Hurst exponents `h(q)`, the scaling exponents `τ(q)`, the
+    singularity strength `α`, and the singularity spectrum `f(α)`, as
+    `hurst_exponents()`, `scaling_exponents()`, and `singularity_spectrum()`
+    would separately.
+
+    Parameters
+    ----------
+    lag: np.array of ints
+        An array with the window sizes which where used in MFDFA.
+
+    mdfda: np.ndarray
+        Matrix of the fluctuation function from MFDFA `(lags, q)`. Stacked
+        fluctuation functions `(lags, q, M)`, e.g., of several timeseries or
+        of bootstrap replicates, give the results of shape `(q, M)`.
+
+    q: np.array
+        Fractal exponents used. Must be more than 2 points.
+
+    lim: list (default `[int(lag.size // 1.5), int(lag.size // 8)]`)
+        List of lower and upper lag limits. If you wish to consider the full
+        range, use `None` to unbound the limits (lower or upper) and thus
+        consider the full lag, e.g., `lim=[None, None]`.
+
+    interpolate: int (default False)
+        Interpolates the `q` space to smoothed the singularity spectrum. Not
+        yet implemented.
+
+    Returns
+    -------
+    res: Spectrum
+        Named tuple with the fields `q`, `hq`, `tau`, `alpha`, and `f`.
+
+    Examples
+    --------
+    >>> q, hq, tau, alpha, f = spectrum(lag, dfa, q)
+
+    Notes
+    -----
+    .. versionadded:: 0.4.4
+    """
+
+    # clean q
+    q = _clean_q(q)
+
+    # Calculate the slopes, i.e., h(q)
+    hq = _slopes(lag, mfdfa, q, lim, interpolate)
+
+    # q along the first axis of the results
+    q_ = _column(q, hq)
+
+    # Calculate tau
+    tau = q_ * hq - 1
+
+    # Calculate α, which needs tau
+    alpha = np.gradient(tau, axis=0) / np.gradient(q_, axis=0)
+
+    # Calculate Dq, which needs tau and q
+    f = _falpha(tau, alpha, q_)
+
+    return Spectrum(q, hq, tau, alpha, f)
+
+
 def singularity_spectrum(lag: np.array, mfdfa: np.ndarray, q: np.array,
                          lim: list = [False, False], interpolate: int = False
                          ) -> Tuple[np.array, np.array]:
@@ -35,7 +122,9 @@ def singularity_spectrum(lag: np.array, mfdfa: np.ndarray, q: np.array,
         An array with the window sizes which where used in MFDFA.
 
     mdfda: np.ndarray
-        Matrix of the fluctuation function from MFDFA
+        Matrix of the fluctuation function from MFDFA `(lags, q)`. Stacked
+        fluctuation functions `(lags, q, M)`, e.g., of several timeseries or
+        of bootstrap replicates, give the results of shape `(q, M)`.
 
     q: np.array
         Fractal exponents used. Must be more than 2 points.
@@ -73,27 +162,9 @@ def singularity_spectrum(lag: np.array, mfdfa: np.ndarray, q: np.array,
         A, 316(1-4), 87–114, 2002.
     """
 
-    # if no lower limit is given
-    if lim[0] is False:
-        lim[0] = int(lag.size // 8)
-
-    # if no upper limit is given
-    if lim[1] is False:
-         lim[1] = int(lag.size // 1.5)
-
-    # clean q
-    q = _clean_q(q)
-
-    # Calculate tau
-    _, tau = scaling_exponents(lag, mfdfa, q, lim, interpolate)
-
-    # Calculate α, which needs tau
-    alpha = np.gradient(tau) / np.gradient(q)
-
-    # Calculate Dq, which needs tau and q
-    f = _falpha(tau, alpha, q)
+    res = spectrum(lag, mfdfa, q, lim, interpolate)
 
-    return alpha, f
+    return res.alpha, res.f
 
 
 def scaling_exponents(lag: np.array, mfdfa: np.ndarray, q: np.array,
@@ -118,7 +189,9 @@ def scaling_exponents(lag: np.array, mfdfa: np.ndarray, q: np.array,
         An array with the window sizes which where used in MFDFA.
 
     mdfda: np.ndarray
-        Matrix of the fluctuation function from MFDFA
+        Matrix of the fluctuation function from MFDFA `(lags, q)`. Stacked
+        fluctuation functions `(lags, q, M)`, e.g., of several timeseries or
+        of bootstrap replicates, give the results of shape `(q, M)`.
 
     q: np.array
         Fractal exponents used. Must be more than 2 points.
@@ -156,21 +229,13 @@ def scaling_exponents(lag: np.array, mfdfa: np.ndarray, q: np.array,
         A, 316(1-4), 87–114, 2002.
     """
 
-    # if no lower limit is given
-    if lim[0] is False:
-        lim[0] = int(lag.size // 8)
-
-    # if no upper limit is given
-    if lim[1] is False:
-         lim[1] = int(lag.size // 1.5)
-
     # clean q
     q = _clean_q(q)
 
     # Calculate the slopes
     slopes = _slopes(lag, mfdfa, q, lim, interpolate)
 
-    return q, (q * slopes) - 1
+    return q, (_column(q, slopes) * slopes) - 1
 
 
 def hurst_exponents(lag: np.array, mfdfa: np.ndarray, q: np.array,
@@ -191,7 +256,9 @@ def hurst_exponents(lag: np.array, mfdfa: np.ndarray, q: np.array,
         An array with the window sizes which where used in MFDFA.
 
     mdfda: np.ndarray
-        Matrix of the fluctuation function from MFDFA
+        Matrix of the fluctuation function from MFDFA `(lags, q)`. Stacked
+        fluctuation functions `(lags, q, M)`, e.g., of several timeseries or
+        of bootstrap replicates, give the results of shape `(q, M)`.
 
     q: np.array
         Fractal exponents used. Must be more than 2 points.
@@ -227,14 +294,6 @@ def hurst_exponents(lag: np.array, mfdfa: np.ndarray, q: np.array,
         A, 316(1-4), 87–114, 2002.
     """
 
-    # if no lower limit is given
-    if lim[0] is False:
-        lim[0] = int(lag.size // 8)
-
-    # if no upper limit is given
-    if lim[1] is False:
-         lim[1] = int(lag.size // 1.5)
-
     # clean q
     q = _clean_q(q)
 
@@ -249,14 +308,24 @@ def _slopes(lag: np.array, mfdfa: np.ndarray, q: np.array,
             ) -> np.array:
     """
     Extra the slopes of each `q` power obtained with MFDFA to later produce
-    either the singularity spectrum or the multifractal exponents.
+    either the singularity spectrum or the multifractal exponents. The
+    abscissa `log(lag)` is the same for all `q`, thus all slopes are given by
+    a single product of the logarithm of the fluctuation function with the
+    pseudo-inverse of the design matrix of the linear fit. Any axes after
+    `q`, e.g., of several timeseries, are fitted as well.
 
     Notes
     -----
     .. versionadded:: 0.4.1
 
+    .. versionchanged:: 0.4.4
+        The fits are vectorised over `q`, and `lim` is no longer modified.
+
     """
 
+    # Copy, the default is shared between calls
+    lim = list(lim)
+
     # if no lower limit is given
     if lim[0] is False:
         lim[0] = int(lag.size // 8)
@@ -277,17 +346,12 @@ def _slopes(lag: np.array, mfdfa: np.ndarray, q: np.array,
             "Fluctuation function and q powers don't match in dimension."
         )
 
-    # Allocated array for slopes
-    slopes = np.zeros(len(q))
+    # Slope row of the pseudo-inverse of the design matrix [log(lag), 1]
+    X = np.log(lag[lim[0]:lim[1]])
+    pinv = np.linalg.pinv(np.vander(X, 2))[0]
 
     # Find slopes of each q-power
-    for i in range(len(q)):
-        slopes[i] = polyfit(np.log(lag[lim[0]:lim[1]]),
-                            np.log(mfdfa[lim[0]:lim[1], i]),
-                            1
-                            )[1]
-
-    return slopes
+    return np.tensordot(pinv, np.log(mfdfa[lim[0]:lim[1]]), axes=1)
 
 
 def _falpha(tau, alpha, q) -> np.array:
@@ -408,14 +472,24 @@ def hurst_exponents_plot(q, hq) -> Tuple['plt.fig', 'plt.Axes']:
     return fig, ax
 
 
+def _column(q: np.array, x: np.ndarray) -> np.array:
+    """
+    `q` reshaped to broadcast along the first axis of `x`, i.e., the axis of
+    the `q` powers of the results of several fluctuation functions.
+
+    Notes
+    -----
+    .. versionadded:: 0.4.4
+    """
+
+    return q.reshape((-1,) + (1,) * (x.ndim - 1))
+
+
 def _clean_q(q) -> np.array:
 
     # Fractal powers as floats
     q = np.asarray_chkfinite(q, dtype=float)
 
-    # Ensure q≈0 is removed, since it does not converge. Limit set at |q| < 0.1
-    q = q[(q < -.1) + (q > .1)]
-
     # Reshape q to perform np.float_power
     q = q.flatten()
 
@@ -0,0 +1,180 @@
+# This is based on Kantelhardt, J. W., Zschiegner, S. A., Koscielny-Bunde, E.,
+# Havlin, S., Bunde, A., & Stanley, H. E., Multifractal detrended fluctuation
+# analysis of nonstationary time series. Physica A, 316(1-4), 87-114, 2002.
+
+from typing import Tuple
+
+import numpy as np
+from .MFDFA import _combine_moments, _detrended_variance, _powers, _roots
+
+__all__ = [
+    'StreamingMFDFA'
+]
+
+
+class StreamingMFDFA:
+    """
+    Multifractal Detrended Fluctuation Analysis of a timeseries given in
+    chunks, e.g., of live data. Each chunk extends the profile of the
+    timeseries, and every segment that is completed is detrended once, and
+    its variance `F²(v,s)` added to the sums of `[F²(v,s)]^{q/2}` of its lag.
+    Old data is never revisited, only the profile since the earliest
+    incomplete segment is kept, i.e., less than `max(lag)` points.
+
+    The fluctuation function :math:`F_q^2(s)` can be obtained at any time
+    with `fluctuation()`. It is the one of `MFDFA()` with the segmentation
+    only from the beginning of the timeseries, since the end of the
+    timeseries is not known in advance.
+
+    Parameters
+    ----------
+    lag: np.ndarray of ints
+        An array with the window sizes to calculate (ints). As in `MFDFA()`,
+        only lags with `lag > order + 1` are kept.
+
+    order: int (default `1`)
+        The order of the polynomials to approximate. Must be `≥ 1`, see
+        Notes.
+
+    q: np.ndarray (default `2`)
+        Fractal exponent to calculate. Array in `[-10,10]`. As in `MFDFA()`,
+        `q = 0` gives the logarithmic average.
+
+    stat: bool (default `False`)
+        Keep also the sums of the squared deviations of the powers from their
+        mean, to calculate the standard deviation associated with each
+        segment's averaging. These are updated with the ones of each chunk
+        as in `MFDFA()`, see `_combine_moments()`.
+
+    Notes
+    -----
+    The mean of the timeseries is not known in advance, thus the profile is
+    taken relative to the mean of the first chunk. The profile then differs
+    from the one of `MFDFA()` by a linear trend, which the polynomial
+    detrending of order `≥ 1` removes exactly. The `modified` (second
+    integration) profile is not available, since it needs the mean of the
+    profile.
+
+    .. versionadded:: 0.4.4
+    """
+
+    def __init__(self, lag: np.ndarray, order: int = 1, q: np.ndarray = 2,
+                 stat: bool = False):
+
+        assert order >= 1, "'order' must be >= 1 for a streaming profile"
+
+        # Force lag to be ints, ensure lag > order + 1
+        lag = np.asarray(lag)
+        lag = lag[lag > order + 1]
+        self.lag = np.round(lag).astype(int)
+
+        if self.lag.size == 0:
+            raise ValueError(
+                "No lag > order + 1 = {}, thus no segments to detrend."
+                .format(order + 1)
+            )
+
+        # Fractal powers as floats. q = 0 is the logarithmic average
+        self.q = np.asarray_chkfinite(q, dtype=float).reshape(-1)
+
+        self.order = order
+        self.stat = stat
+
+        # Size of the timeseries so far, its reference level, and the profile
+        # since the global index `_start`
+        self.N = 0
+        self._offset = None
+        self._profile = np.empty(0)
+        self._start = 0
+
+        # Start of the next segment of each lag
+        self._next = np.zeros(self.lag.size, dtype=int)
+
+        # Running number of segments, sum of the powers of their variances,
+        # and sum of the squared deviations of the powers from their mean, of
+        # each lag, see _combine_moments()
+        self._moments = [[0, np.zeros((self.q.size, 1, 1)),
+                          np.zeros((self.q.size, 1, 1))] for _ in self.lag]
+
+    def update(self, chunk: np.ndarray) -> None:
+        """
+        Add a chunk of the timeseries, and the segments it completes to the
+        sums of each lag.
+
+        Parameters
+        ----------
+        chunk: np.ndarray
+            The next 1-dimensional chunk of the timeseries.
+        """
+
+        chunk = np.asarray_chkfinite(chunk, dtype=float).reshape(-1)
+
+        if chunk.size == 0:
+            return
+
+        if self._offset is None:
+            self._offset = np.mean(chunk)
+
+        # Extend the profile
+        last = self._profile[-1] if self._profile.size else 0.
+        self._profile = np.concatenate(
+            [self._profile, last + np.cumsum(chunk - self._offset)]
+        )
+        self.N += chunk.size
+
+        q = self.q.reshape(-1, 1, 1, 1)
+
+        for n, i in enumerate(self.lag):
+            # Completed segments since the last update
+            k = (self.N - self._next[n]) // i
+            if k == 0:
+                continue
+
+            a = self._next[n] - self._start
+            Y_ = self._profile[a:a + k * i].reshape(k, i)
+
+            with np.errstate(divide='ignore'):
+                logF = np.log(_detrended_variance(Y_, self.order))
+
+            _combine_moments(self._moments[n],
+                             _powers(logF[None, :, None], q), self.stat)
+
+            self._next[n] += k * i
+
+        # Discard the profile of the completed segments of all lags
+        drop = self._next.min() - self._start
+        self._profile = self._profile[drop:]
+        self._start += drop
+
+    def fluctuation(self) -> Tuple[np.ndarray, ...]:
+        """
+        The fluctuation function of the timeseries so far, in `O(lags·q)`.
+
+        Returns
+        -------
+        lag: np.ndarray of ints
+            Array of lags.
+
+        f: np.ndarray
+            A array of shape `(size(lag),size(q))` of variances over the
+            indicated lag windows and the indicated q-fractal powers. Lags
+            without any completed segment are `nan`.
+
+        f_std: np.ndarray
+            If `stat = True`, the standard deviation associated with each
+            mean, of the same shape as `f`.
+        """
+
+        count = np.array([m[0] for m in self._moments]).reshape(-1, 1)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            total = np.stack([m[1][:, 0, 0] for m in self._moments])
+            f = _roots((total / count).T, self.q).T
+
+            if self.stat is False:
+                return self.lag, f
+
+            M2 = np.stack([m[2][:, 0, 0] for m in self._moments])
+            f_std = _roots(np.sqrt(M2 / count).T, self.q).T
+
+        return self.lag, f, f_std
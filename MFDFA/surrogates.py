@@ -0,0 +1,271 @@
+# This is based on Schreiber, T., & Schmitz, A., Improved surrogate data for
+# nonlinearity tests. Phys. Rev. Lett., 77(4), 635-638, 1996, and on Theiler,
+# J., Eubank, S., Longtin, A., Galdrikian, B., & Farmer, J. D., Testing for
+# nonlinearity in time series: the method of surrogate data. Physica D,
+# 58(1-4), 77-94, 1992.
+
+from typing import NamedTuple
+
+import numpy as np
+from .MFDFA import MFDFA
+from .singspect import spectrum
+
+__all__ = [
+    'surrogates',
+    'Significance',
+    'significance'
+]
+
+
+def surrogates(timeseries: np.ndarray, n: int, method: str = 'shuffle',
+               seed=None, iterations: int = 100) -> np.ndarray:
+    """
+    Surrogates of a timeseries, generated together as the columns of a
+    single array, such that they can be given directly to `MFDFA()`.
+
+    Parameters
+    ----------
+    timeseries: np.ndarray
+        A 1-dimensional timeseries of length `N`.
+
+    n: int
+        Number of surrogates.
+
+    method: str (default `'shuffle'`)
+     - `'shuffle'`: Random permutations of the timeseries, which keep its
+        distribution and destroy all correlations.
+     - `'phase'`: Fourier phase randomisation, which keeps the power
+        spectrum, i.e., the linear correlations, but not the distribution.
+     - `'iaaft'`: Iterative amplitude adjusted Fourier transform, which keeps
+        the distribution and approximately the power spectrum.
+
+    seed: int or np.random.Generator (default `None`)
+        Seed of the surrogates.
+
+    iterations: int (default `100`)
+        Maximal number of iterations of `'iaaft'`, which stops earlier if the
+        ranks of no surrogate change.
+
+    Returns
+    -------
+    X: np.ndarray
+        The surrogates, of shape `(N, n)`.
+
+    Notes
+    -----
+    .. versionadded:: 0.4.4
+
+    References
+    ----------
+    .. [Theiler1992] J. Theiler, S. Eubank, A. Longtin, B. Galdrikian, and J.
+        D. Farmer. "Testing for nonlinearity in time series: the method of
+        surrogate data." Physica D, 58(1-4), 77–94, 1992.
+    .. [Schreiber1996] T. Schreiber and A. Schmitz. "Improved surrogate data
+        for nonlinearity tests." Phys. Rev. Lett., 77(4), 635–638, 1996.
+    """
+
+    assert method in ('shuffle', 'phase', 'iaaft'), \
+        "'method' must be 'shuffle', 'phase', or 'iaaft'"
+
+    timeseries = np.asarray_chkfinite(timeseries, dtype=float).reshape(-1)
+    N = timeseries.size
+
+    rng = np.random.default_rng(seed)
+
+    if method == 'phase':
+        return _phase_randomised(timeseries, n, rng)
+
+    # Random permutations of each column
+    X = timeseries[np.argsort(rng.random((N, n)), axis=0)]
+
+    if method == 'shuffle':
+        return X
+
+    # Amplitudes of the spectrum and sorted values to impose
+    amplitude = np.abs(np.fft.rfft(timeseries))[:, None]
+    values = np.sort(timeseries)
+
+    ranks = np.argsort(np.argsort(X, axis=0), axis=0)
+    for _ in range(iterations):
+        # Impose the spectrum, keeping the phases
+        S = np.fft.rfft(X, axis=0)
+        S *= amplitude / np.maximum(np.abs(S), np.finfo(float).tiny)
+        X = np.fft.irfft(S, n=N, axis=0)
+
+        # Impose the distribution, keeping the ranks
+        ranks_ = np.argsort(np.argsort(X, axis=0), axis=0)
+        X = values[ranks_]
+
+        if np.array_equal(ranks, ranks_):
+            break
+        ranks = ranks_
+
+    return X
+
+
+def _phase_randomised(timeseries: np.ndarray, n: int,
+                      rng: np.random.Generator) -> np.ndarray:
+    """
+    `n` surrogates `(N, n)` of the timeseries with the phases of its Fourier
+    transform replaced by uniformly random ones. The mean, and the Nyquist
+    frequency of even lengths, are kept real.
+
+    Notes
+    -----
+    .. versionadded:: 0.4.4
+    """
+
+    N = timeseries.size
+
+    S = np.fft.rfft(timeseries)[:, None]
+
+    phases = np.exp(2j * np.pi * rng.random((S.shape[0], n)))
+    phases[0] = 1
+    if N % 2 == 0:
+        phases[-1] = 1
+
+    return np.fft.irfft(S * phases, n=N, axis=0)
+
+
+class Significance(NamedTuple):
+    """
+    The results of `significance()`.
+
+    Attributes
+    ----------
+    dh: float
+        Width `Δh = max(h(q)) - min(h(q))` of the generalised Hurst exponents
+        of the timeseries.
+
+    dalpha: float
+        Width `Δα = max(α) - min(α)` of the singularity spectrum of the
+        timeseries.
+
+    dh_null: np.ndarray
+        `Δh` of each surrogate.
+
+    dalpha_null: np.ndarray
+        `Δα` of each surrogate.
+
+    p_h: float
+        Fraction of surrogates (counting the timeseries) with `Δh` at least
+        the one of the timeseries.
+
+    p_alpha: float
+        Fraction of surrogates (counting the timeseries) with `Δα` at least
+        the one of the timeseries.
+
+    Notes
+    -----
+    .. versionadded:: 0.4.4
+    """
+
+    dh: float
+    dalpha: float
+    dh_null: np.ndarray
+    dalpha_null: np.ndarray
+    p_h: float
+    p_alpha: float
+
+
+def significance(timeseries: np.ndarray, lag: np.ndarray, q: np.ndarray,
+                 n: int = 100, method: str = 'shuffle', order: int = 1,
+                 modified: bool = False, lim: list = [False, False],
+                 seed=None, iterations: int = 100, memory: int = 2 ** 27,
+                 **kwargs) -> Significance:
+    """
+    Null distributions of the widths `Δh` and `Δα` of the multifractal
+    spectrum of a timeseries, from `n` of its `surrogates()`. The surrogates
+    are generated in batches, each analysed by a single call of `MFDFA()` on
+    the stacked surrogates, and its spectra obtained together. A width of the
+    timeseries beyond the ones of the surrogates indicates a multifractality
+    not due to what the surrogates keep, e.g., not only due to the
+    distribution for `'shuffle'`, or to the linear correlations for
+    `'phase'` and `'iaaft'`.
+
+    Parameters
+    ----------
+    timeseries: np.ndarray
+        A 1-dimensional timeseries of length `N`.
+
+    lag: np.ndarray of ints
+        An array with the window sizes to calculate (ints), see `MFDFA()`.
+
+    q: np.ndarray
+        Fractal exponents to calculate. Must be more than 2 points.
+
+    n: int (default `100`)
+        Number of surrogates.
+
+    method: str (default `'shuffle'`)
+        The surrogates, see `surrogates()`.
+
+    order: int (default `1`)
+        The order of the polynomials to approximate, see `MFDFA()`.
+
+    modified: bool (default `False`)
+        Second integration of the timeseries, see `MFDFA()`.
+
+    lim: list (default `[int(lag.size // 1.5), int(lag.size // 8)]`)
+        List of lower and upper lag limits of the fits, see
+        `singspect.spectrum()`.
+
+    seed: int or np.random.Generator (default `None`)
+        Seed of the surrogates.
+
+    iterations: int (default `100`)
+        Maximal number of iterations of `'iaaft'`.
+
+    memory: int (default `2 ** 27`, i.e., 128 MB)
+        Approximate limit in bytes of the surrogates of each batch, also
+        given to `MFDFA()`.
+
+    kwargs:
+        Further arguments of `MFDFA()`, e.g., `extensions`, `backend`, or
+        `n_jobs`.
+
+    Returns
+    -------
+    res: Significance
+        Named tuple with the fields `dh`, `dalpha`, `dh_null`, `dalpha_null`,
+        `p_h`, and `p_alpha`.
+
+    Notes
+    -----
+    .. versionadded:: 0.4.4
+    """
+
+    timeseries = np.asarray_chkfinite(timeseries, dtype=float).reshape(-1)
+
+    rng = np.random.default_rng(seed)
+
+    # Spectrum of the timeseries
+    lag_, f = MFDFA(timeseries, lag, order=order, q=q, modified=modified,
+                    memory=memory, **kwargs)
+    res = spectrum(lag_, f, q, lim)
+
+    dh = np.ptp(res.hq)
+    dalpha = np.ptp(res.alpha)
+
+    dh_null = np.empty(n)
+    dalpha_null = np.empty(n)
+
+    # Surrogates per batch. The analysis of each holds a few copies of it
+    batch = max(memory // (8 * timeseries.size * 4), 1)
+
+    for k in range(0, n, batch):
+        X = surrogates(timeseries, min(batch, n - k), method, rng, iterations)
+
+        _, f = MFDFA(X, lag, order=order, q=q, modified=modified,
+                     memory=memory, **kwargs)
+
+        # The spectra of all surrogates of the batch, (q, batch)
+        res = spectrum(lag_, f.reshape(f.shape[:2] + (-1,)), q, lim)
+
+        dh_null[k:k + batch] = np.ptp(res.hq, axis=0)
+        dalpha_null[k:k + batch] = np.ptp(res.alpha, axis=0)
+
+    p_h = (1 + np.sum(dh_null >= dh)) / (n + 1)
+    p_alpha = (1 + np.sum(dalpha_null >= dalpha)) / (n + 1)
+
+    return Significance(dh, dalpha, dh_null, dalpha_null, p_h, p_alpha)
@@ -0,0 +1,56 @@
+import numpy as np
+
+import sys
+sys.path.append("../")
+from MFDFA import MFDFA
+
+def test_batched():
+    for N in [1000, 10000]:
+        for M in [1, 3]:
+
+            X = np.random.normal(size = (N, M), loc = 0)
+            q = np.linspace(-10, 10, 6)
+
+            lag = np.unique(
+                  np.logspace(
+                  0, np.log10(N // 4), 25
+                  ).astype(int) + 1
+                )
+
+            for backend in ['projection', 'moments']:
+                lag_, dfa, dfa_std, edfa = MFDFA(X, lag=lag, q=q, order=1,
+                  stat = True, extensions = {'eDFA': True},
+                  backend = backend)
+
+                if M == 1:
+                    assert dfa.shape == (lag_.size, q.size), \
+                        "Output shape mismatch"
+                else:
+                    assert dfa.shape == (lag_.size, q.size, M), \
+                        "Output shape mismatch"
+                assert edfa.shape == (lag_.size, M), "Output shape mismatch"
+
+                # Each timeseries on its own
+                for m in range(M):
+                    _, dfa_m, dfa_std_m, edfa_m = MFDFA(X[:, m], lag=lag,
+                      q=q, order=1, stat = True, extensions = {'eDFA': True},
+                      backend = backend)
+
+                    assert np.allclose(dfa.reshape(dfa_m.shape + (M,))[..., m],
+                                       dfa_m), "Batched MFDFA mismatch"
+                    assert np.allclose(edfa[:, m], edfa_m[:, 0]), \
+                        "Batched eDFA mismatch"
+
+def test_list():
+    X = [np.random.normal(size = N) for N in [1000, 2000, 1000]]
+    q = np.linspace(-10, 10, 6)
+
+    lag = np.unique(np.logspace(0, np.log10(250), 25).astype(int) + 1)
+
+    lag_, dfa = MFDFA(X, lag=lag, q=q, order=2)
+
+    assert dfa.shape == (lag_.size, q.size, 3), "Output shape mismatch"
+
+    for m in range(3):
+        _, dfa_m = MFDFA(X[m], lag=lag, q=q, order=2)
+        assert np.allclose(dfa[..., m], dfa_m), "List MFDFA mismatch"
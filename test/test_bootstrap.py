@@ -0,0 +1,32 @@
+import numpy as np
+
+import sys
+sys.path.append("../")
+from MFDFA import MFDFA, bootstrap
+
+def test_bootstrap():
+    for M in [1, 2]:
+        X = np.random.normal(size = (5000, M), loc = 0).squeeze()
+        q = np.linspace(-4, 4, 9)
+
+        lag = np.unique(np.logspace(0, np.log10(1250), 30).astype(int) + 3)
+
+        res = bootstrap(X, lag, q=q, order=1, n_boot = 100, seed = 1)
+
+        lag_, dfa = MFDFA(X, lag=lag, q=q, order=1)
+        assert np.allclose(res.f, dfa), "Bootstrap fluctuation mismatch"
+
+        shape = (q.size,) + (M,) * (M > 1)
+        assert res.f_boot.shape == dfa.shape + (100,), "Replicates shape"
+        assert res.replicates.hq.shape == shape + (100,), "Replicates shape"
+        assert res.low.alpha.shape == shape, "Interval shape mismatch"
+
+        assert np.all(res.low.hq <= res.high.hq), "Interval bounds swapped"
+        assert np.all(res.replicates.hq.std(axis=-1) > 0), "No resampling"
+
+        # Reproducible regardless of the workers
+        for executor in ['thread', 'process']:
+            res_ = bootstrap(X, lag, q=q, order=1, n_boot = 100, seed = 1,
+                             n_jobs = 2, executor = executor, memory = 2 ** 14)
+            assert np.allclose(res.f_boot, res_.f_boot), \
+                "Bootstrap not reproducible"
@@ -0,0 +1,25 @@
+import numpy as np
+from numpy.polynomial.polynomial import polyfit, polyval
+
+import sys
+sys.path.append("../")
+from MFDFA.MFDFA import _detrended_variance
+
+def test_detrending():
+    for lag in [5, 20, 100]:
+        for order in [0, 1, 2, 3]:
+
+            Y = np.cumsum(np.random.normal(size = 20 * lag))
+            Y_ = Y.reshape(-1, lag)
+
+            X = np.linspace(1, lag, lag)
+
+            # Reference with an explicit polynomial fit per segment
+            if order == 0:
+                F = np.var(Y_, axis=1)
+            else:
+                p = polyfit(X, Y_.T, order)
+                F = np.var(Y_ - polyval(X, p), axis=1)
+
+            assert np.allclose(_detrended_variance(Y_, order), F), \
+                "Projection detrending does not match polynomial fit"
@@ -0,0 +1,57 @@
+import numpy as np
+
+import sys
+sys.path.append("../")
+from MFDFA import MFDFA, fgn, singspect
+
+def _dma(X, lag, theta, q):
+    # MF-DMA of each lag point by point, as in Gu & Zhou (2010)
+    Y = np.cumsum(X - X.mean())
+    f = []
+    for n in lag:
+        before = int(np.ceil((n - 1) * (1 - theta)))
+        after = int(np.floor((n - 1) * theta))
+        e = np.array([Y[i] - Y[i - before:i + after + 1].mean()
+                      for i in range(before, Y.size - after)])
+
+        S = e.size // n
+        F = np.concatenate([
+            np.mean(e[:S * n].reshape(S, n) ** 2, axis = 1),
+            np.mean(e[e.size % n:].reshape(S, n) ** 2, axis = 1)
+        ])
+        f.append([np.mean(F ** (q_ / 2)) ** (1 / q_) for q_ in q])
+
+    return np.array(f)
+
+def test_dma():
+    X = np.random.normal(size = 2000)
+    lag = np.array([3, 4, 5, 8, 13, 30, 100])
+    q = np.array([-2, 2, 3])
+
+    for backend, theta in [('dma-backward', 0), ('dma-centred', 0.5),
+                           ('dma-forward', 1), ('dma', 0.5)]:
+        lag_, dfa = MFDFA(X, lag, q = q, backend = backend)
+        assert np.allclose(dfa, _dma(X, lag_, theta, q)), "MF-DMA mismatch"
+
+    # Same return conventions as the polynomial detrending
+    lag = np.unique(np.logspace(0.5, 2.5, 20).astype(int))
+    res = MFDFA(X, lag, q = q, stat = True, backend = 'dma',
+                extensions = {'eDFA': True, 'window': 3})
+    res_p = MFDFA(X, lag, q = q, stat = True,
+                  extensions = {'eDFA': True, 'window': 3})
+    assert [r.shape for r in res] == [r.shape for r in res_p], \
+        "Shape mismatch"
+
+    lag_, dfa = MFDFA(np.stack([X, X[::-1]], axis = 1), lag, q = q,
+                      backend = 'dma')
+    assert np.allclose(dfa[:, :, 0], MFDFA(X, lag, q = q,
+                                           backend = 'dma')[1]), \
+        "Stacked MF-DMA mismatch"
+
+    # The Hurst index of fractional Gaussian noise
+    lag = np.unique(np.logspace(0.7, 3, 20).astype(int))
+    for H in [0.3, 0.7]:
+        X = fgn(2 ** 15, H = H, seed = 1)
+        lag_, dfa = MFDFA(X, lag, q = q, backend = 'dma')
+        q_, hq = singspect.hurst_exponents(lag_, dfa, q)
+        assert np.isclose(hq[1], H, atol = 0.05), "Hurst index mismatch"
@@ -0,0 +1,95 @@
+import numpy as np
+
+import os
+import sys
+import tempfile
+sys.path.append("../")
+from MFDFA import MFDFA, fgn
+
+def test_dtype():
+    X = fgn(20000, H = 0.7, n_paths = 2, seed = 1)
+    lag = np.unique(np.logspace(0.7, 3.5, 20).astype(int))
+    q = np.linspace(-5, 5, 11)
+
+    # Expected accuracy of single precision for each order, see MFDFA()
+    for order, rtol in [(0, 1e-5), (1, 1e-5), (2, 1e-4), (3, 1e-4)]:
+        for modified in [False, True]:
+            lag_, dfa, dfa_std = MFDFA(X, lag, order = order, q = q,
+                                       stat = True, modified = modified)
+            lag_, dfa32, dfa32_std = MFDFA(X, lag, order = order, q = q,
+                                           stat = True, modified = modified,
+                                           dtype = np.float32)
+
+            assert dfa32.shape == dfa.shape, "Fluctuation shape mismatch"
+            assert np.allclose(dfa32, dfa, rtol = rtol, atol = 0), \
+                "Single precision mismatch"
+            assert np.allclose(dfa32_std, dfa_std, rtol = 10 * rtol,
+                               atol = 0), "Single precision std mismatch"
+
+            # The slopes are considerably less affected
+            h = np.polyfit(np.log(lag_), np.log(dfa.reshape(lag_.size, -1)),
+                           1)[0]
+            h32 = np.polyfit(np.log(lag_),
+                             np.log(dfa32.reshape(lag_.size, -1)), 1)[0]
+            assert np.allclose(h32, h, atol = rtol / 10), "Slopes mismatch"
+
+    # Single precision timeseries are integrated in double precision
+    for kwargs in [{}, {'backend': 'moments'}, {'extensions': {'window': 3}}]:
+        lag_, dfa = MFDFA(X, lag, q = q, **kwargs)
+        lag_, dfa32 = MFDFA(X.astype(np.float32), lag, q = q,
+                            dtype = np.float32, **kwargs)
+        assert np.allclose(dfa32, dfa, rtol = 1e-4), \
+            "Single precision timeseries mismatch"
+
+    # Out-of-core
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'X.npy')
+        np.save(path, X)
+        for modified in [False, True]:
+            lag_, dfa = MFDFA(X, lag, q = q, modified = modified)
+            lag_, dfa32 = MFDFA(path, lag, q = q, modified = modified,
+                                dtype = np.float32, memory = 2 ** 16)
+            assert np.allclose(dfa32, dfa, rtol = 1e-5), \
+                "Out-of-core single precision mismatch"
+
+def test_dtype_smooth():
+    # Smooth profiles, whose residuals of small lags are not resolved in
+    # single precision. The twice integrated random walk is shorter, since
+    # for more points these are not resolved in double precision either
+    rng = np.random.default_rng(3)
+    q = np.array([-5, -2, 0, 2, 5])
+
+    for N, modified in [(100000, False), (10000, True)]:
+        X = np.cumsum(rng.normal(size = N))
+        for order in [1, 2, 3]:
+            lag = np.unique(np.logspace(np.log10(order + 2), 3,
+                                        15).astype(int))
+            lag_, dfa = MFDFA(X, lag, order = order, q = q,
+                              modified = modified)
+            lag_, dfa32 = MFDFA(X, lag, order = order, q = q,
+                                modified = modified, dtype = np.float32)
+
+            assert np.allclose(dfa32, dfa, rtol = 1e-4, atol = 0), \
+                "Single precision smooth profile mismatch"
+
+def test_dtype_powers():
+    # Variances far outside the range of single precision powers
+    X = np.random.normal(size = 10000) * 1e-10
+    lag = np.unique(np.logspace(0.7, 3, 10).astype(int))
+    q = np.array([-10, -2, 0, 2, 10])
+
+    lag, dfa = MFDFA(X, lag, q = q)
+    lag, dfa32 = MFDFA(X, lag, q = q, dtype = np.float32)
+
+    assert np.all(np.isfinite(dfa32)), "Single precision overflow"
+    assert np.allclose(dfa32, dfa, rtol = 1e-4), "Single precision mismatch"
+
+def test_fgn_dtype():
+    for method in ['daviesharte', 'cholesky', 'hosking']:
+        noise = fgn(1000, H = 0.7, n_paths = 3, seed = 1, method = method)
+        noise32 = fgn(1000, H = 0.7, n_paths = 3, seed = 1, method = method,
+                      dtype = np.float32)
+
+        assert noise32.dtype == np.float32, "Noise not in single precision"
+        assert np.allclose(noise32, noise, atol = 1e-5 * noise.std()), \
+            "Single precision noise mismatch"
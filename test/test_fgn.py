@@ -2,7 +2,11 @@ import numpy as np
 
 import sys
 sys.path.append("../")
-from MFDFA import fgn
+from MFDFA import fgn, fgn_chunks
+from MFDFA.fgn import _eigenvalues
+import os
+import tempfile
+import warnings
 
 def test_fgn():
     for H in [0.3, 0.5, 0.7]:
@@ -11,3 +15,102 @@ def test_fgn():
             noise = fgn(N, H = H)
 
             assert noise.size == N, "Generated noise size not N"
+
+def test_fgn_paths():
+    for H in [0.3, 0.7]:
+        noise = fgn(1000, H = H, n_paths = 5, seed = 1)
+        assert noise.shape == (1000, 5), "Generated paths shape mismatch"
+
+        # Reproducible with a seed, and the paths independent
+        assert np.allclose(noise, fgn(1000, H = H, n_paths = 5, seed = 1)), \
+            "Generated paths not reproducible"
+        assert not np.allclose(noise[:, 0], noise[:, 1]), "Paths repeated"
+
+        # The global state is used without a seed
+        np.random.seed(1)
+        noise = fgn(1000, H = H)
+        np.random.seed(1)
+        assert np.allclose(noise, fgn(1000, H = H, n_paths = 1)[:, 0]), \
+            "Single path mismatch"
+
+        rng = np.random.default_rng(2)
+        assert fgn(1000, H = H, seed = rng).shape == (1000,), \
+            "Generated noise size not N"
+
+def test_fgn_methods():
+    N = 32
+    for H in [0.1, 0.5, 0.95]:
+        # Empirical covariance of many paths
+        k = np.arange(N)
+        cor = 0.5 * (abs(k - 1) ** (2 * H) - 2 * k ** (2 * H)
+                     + (k + 1) ** (2 * H)) * (1 / N) ** (2 * H)
+        cov = cor[abs(k[:, None] - k[None, :])]
+
+        for method in ['daviesharte', 'cholesky', 'hosking']:
+            noise = fgn(N, H = H, n_paths = 20000, seed = 1, method = method)
+            assert np.allclose(noise @ noise.T / 20000, cov,
+                               atol = 0.05 * cov[0, 0]), \
+                "Covariance mismatch"
+
+        # The same paths from the same factorisation
+        assert np.allclose(fgn(N, H = H, n_paths = 3, seed = 1,
+                               method = 'cholesky'),
+                           fgn(N, H = H, n_paths = 3, seed = 1,
+                               method = 'hosking')), \
+            "Cholesky and Hosking mismatch"
+
+    # Non-negative eigenvalues for H close to 1, also of large N
+    for H in [0.95, 0.99]:
+        for N_ in [32, 2 ** 20]:
+            assert _eigenvalues(N_, H) is not None, "Negative eigenvalues"
+
+def test_fgn_fallback(monkeypatch):
+    # Negative eigenvalues fall back to Hosking's method, with a warning
+    monkeypatch.setattr(sys.modules['MFDFA.fgn'], '_eigenvalues',
+                        lambda N, H: None)
+
+    with warnings.catch_warnings(record = True) as w:
+        warnings.simplefilter('always')
+        noise = fgn(32, H = 0.7, seed = 2)
+    assert any(issubclass(w_.category, RuntimeWarning) for w_ in w), \
+        "No warning of the fallback"
+    assert np.allclose(noise, fgn(32, H = 0.7, seed = 2,
+                                  method = 'hosking')), \
+        "No fallback for negative eigenvalues"
+
+    # Not for large N, for which Hosking's method is slow
+    try:
+        fgn(2 ** 14, H = 0.7)
+        assert False, "No error for the fallback of large N"
+    except ValueError:
+        pass
+
+def test_fgn_chunks():
+    N = 50000
+    for H in [0.3, 0.7]:
+        chunks = list(fgn_chunks(N, H = H, chunk = 7000, lags = 2 ** 10,
+                                 seed = 1))
+        assert [c.size for c in chunks] == [7000] * 7 + [1000], \
+            "Chunk sizes mismatch"
+
+        # The noise does not depend on the chunks
+        noise = np.concatenate(chunks)
+        assert np.allclose(noise, next(fgn_chunks(N, H = H, chunk = N,
+                                                  lags = 2 ** 10, seed = 1))), \
+            "Chunked noise mismatch"
+
+        # Correlation of neighbours
+        assert np.isclose(np.corrcoef(noise[1:], noise[:-1])[0, 1],
+                          2 ** (2 * H - 1) - 1, atol = 0.02), \
+            "Correlation mismatch"
+
+        # Written into a memmap
+        with tempfile.TemporaryDirectory() as tmp:
+            X = np.lib.format.open_memmap(os.path.join(tmp, 'fgn.npy'),
+                                          mode = 'w+', shape = (N,))
+            for c in fgn_chunks(N, H = H, chunk = 7000, lags = 2 ** 10,
+                                seed = 1, out = X):
+                assert np.shares_memory(c, X), "Chunk not a view of out"
+
+            assert np.allclose(X, noise), "Memmap noise mismatch"
+            del X, c
@@ -0,0 +1,49 @@
+import numpy as np
+
+import sys
+sys.path.append("../")
+from MFDFA import MFDFA, fgn, local_hurst
+
+def test_local_hurst():
+    # A change of the Hurst index halfway
+    X = np.concatenate([fgn(2 ** 14, H = 0.3, seed = 1),
+                        fgn(2 ** 14, H = 0.8, seed = 2)])
+    lag = 2 ** np.arange(2, 11)
+    q = np.array([-2, 0, 2, 4])
+
+    for order in [1, 2]:
+        res = local_hurst(X, lag, 2048, q = q, order = order, step = 512,
+                          lim = [None, None])
+
+        # Only lags of at most half the window
+        assert np.array_equal(res.lag, lag[lag <= 1024]), "Lags mismatch"
+        assert res.time.size == (X.size - 2048) // 512 + 1, \
+            "Number of windows mismatch"
+        assert res.f.shape == (res.lag.size, q.size, res.time.size), \
+            "Fluctuation shape mismatch"
+        assert res.hq.shape == (res.time.size, q.size), "h(q) shape mismatch"
+
+        # Windows aligned with all lags are the same segments as MFDFA of
+        # the window
+        for t in range(0, res.time.size, 6):
+            begin = int(res.time[t] - 1024)
+            lag_, dfa = MFDFA(X[begin:begin + 2048], res.lag, q = q,
+                              order = order)
+            assert np.allclose(res.f[:, :, t], dfa), "Local MFDFA mismatch"
+
+        # The Hurst index of each half
+        assert np.allclose(res.hq[res.time < 2 ** 14 - 1024, 2], 0.3,
+                           atol = 0.1), "Local Hurst index mismatch"
+        assert np.allclose(res.hq[res.time > 2 ** 14 + 1024, 2], 0.8,
+                           atol = 0.1), "Local Hurst index mismatch"
+
+    # The moments backend, and several timeseries
+    res = local_hurst(X, lag, 2048, q = q, step = 512)
+    res_m = local_hurst(X, lag, 2048, q = q, step = 512,
+                        backend = 'moments')
+    assert np.allclose(res_m.f, res.f, rtol = 1e-6), "Moments mismatch"
+
+    res_s = local_hurst(np.stack([X, X[::-1]], axis = 1), lag, 2048, q = q,
+                        step = 512)
+    assert res_s.hq.shape == res.hq.shape + (2,), "Stacked shape mismatch"
+    assert np.allclose(res_s.f[..., 0], res.f), "Stacked mismatch"
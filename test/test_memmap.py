@@ -0,0 +1,45 @@
+import numpy as np
+import os
+import tempfile
+
+import sys
+sys.path.append("../")
+from MFDFA import MFDFA
+
+def test_memmap():
+    with tempfile.TemporaryDirectory() as path:
+        for M in [1, 3]:
+            X = np.random.normal(size = (5000, M), loc = 0).squeeze()
+            q = np.linspace(-10, 10, 6)
+
+            lag = np.unique(np.logspace(0, np.log10(1250), 30).astype(int) + 1)
+
+            file = os.path.join(path, 'X.npy')
+            np.save(file, X)
+
+            for modified in [False, True]:
+                for extensions in [{'eDFA': True}, {'eDFA': True, 'window': 5}]:
+
+                    res = MFDFA(X, lag=lag, q=q, order=1, stat = True,
+                      modified = modified, extensions = extensions)
+
+                    res_ = MFDFA(file, lag=lag, q=q, order=1, stat = True,
+                      modified = modified, extensions = extensions,
+                      memory = 2 ** 14)
+
+                    for r, r_ in zip(res, res_):
+                        assert r.shape == r_.shape, "Memory-mapped shape mismatch"
+                        assert np.allclose(r, r_, rtol = 1e-5), \
+                            "Memory-mapped MFDFA mismatch"
+
+            # Raw binary file
+            X.astype(np.float32).tofile(os.path.join(path, 'X.bin'))
+            X_ = np.memmap(os.path.join(path, 'X.bin'), dtype = np.float32,
+                           mode = 'r', shape = X.shape)
+
+            res = MFDFA(X.astype(np.float32).astype(float), lag=lag, q=q)
+            res_ = MFDFA(X_, lag=lag, q=q, memory = 2 ** 14, n_jobs = 2)
+
+            for r, r_ in zip(res, res_):
+                assert np.allclose(r, r_), "Memory-mapped MFDFA mismatch"
+            del X_
@@ -0,0 +1,58 @@
+import numpy as np
+
+import sys
+sys.path.append("../")
+from MFDFA import MFDFA2D, singspect
+
+def test_mfdfa2d():
+    rng = np.random.default_rng(0)
+    X = rng.normal(size = (120, 100))
+    lag = np.array([2, 3, 5, 8, 13, 20, 50])
+    q = np.array([-2, 0, 2, 4])
+
+    # The surface less its mean, as the profile of MFDFA()
+    Xc = X - np.mean(X)
+
+    for order in [0, 1, 2]:
+        lag_, dfa, dfa_std = MFDFA2D(X, lag, order = order, q = q,
+                                     stat = True, memory = 2 ** 12)
+
+        assert np.array_equal(lag_, lag[lag > order + 1]), "Lags mismatch"
+        assert dfa.shape == dfa_std.shape == (lag_.size, q.size), \
+            "Shape mismatch"
+
+        # Least-square fit of the cumulative sum of each tile
+        for n, s in enumerate(lag_):
+            i, j = np.meshgrid(np.arange(s), np.arange(s), indexing = 'ij')
+            V = np.stack([i.ravel() ** k * j.ravel() ** (d - k)
+                          for d in range(order + 1) for k in range(d + 1)],
+                         axis = 1).astype(float)
+
+            F = []
+            for a in range(X.shape[0] // s):
+                for b in range(X.shape[1] // s):
+                    u = np.cumsum(np.cumsum(Xc[a * s:(a + 1) * s,
+                                              b * s:(b + 1) * s], axis = 0),
+                                  axis = 1).ravel()
+                    r = u - V @ np.linalg.lstsq(V, u, rcond = None)[0]
+                    F.append(np.mean(r ** 2))
+            F = np.array(F)
+
+            assert np.isclose(dfa[n, 0], np.mean(F ** -1) ** -0.5), \
+                "q = -2 mismatch"
+            assert np.isclose(dfa[n, 1], np.exp(np.mean(np.log(F)) / 2)), \
+                "q = 0 mismatch"
+            assert np.isclose(dfa[n, 2], np.mean(F) ** 0.5), "q = 2 mismatch"
+
+    # A surface of white noise
+    X = rng.normal(size = (512, 512))
+    lag = np.unique(np.logspace(0.5, 2, 12).astype(int))
+    lag_, dfa = MFDFA2D(X, lag, q = q, order = 2)
+    q_, hq = singspect.hurst_exponents(lag_, dfa, q)
+    assert np.allclose(hq, 1, atol = 0.1), "White noise h(q) mismatch"
+
+    # The mean of the surface does not change the exponents of a plane fit
+    for c in [1, 100]:
+        lag_, dfa = MFDFA2D(X + c, lag, q = q, order = 1)
+        q_, hq = singspect.hurst_exponents(lag_, dfa, q)
+        assert np.allclose(hq, 1, atol = 0.1), "Shifted surface h(q) mismatch"
@@ -0,0 +1,58 @@
+import numpy as np
+
+import sys
+sys.path.append("../")
+from MFDFA import MFDFA, MFDXA, Profile
+
+def test_mfdxa():
+    rng = np.random.default_rng(0)
+    z = rng.normal(size = 10000)
+
+    # Two series sharing half their variance, one anticorrelated, and one
+    # independent
+    X = np.stack([z + rng.normal(size = 10000), z + rng.normal(size = 10000),
+                  -z, rng.normal(size = 10000)], axis = 1)
+
+    lag = np.unique(np.logspace(0, 3, 20).astype(int))
+    q = np.array([-2, 0, 2, 4])
+
+    for order in [0, 1, 2]:
+        lag_, f, f_std, rho = MFDXA(X, lag, order = order, q = q,
+                                    stat = True, rho = True,
+                                    memory = 2 ** 16)
+        lag_d, dfa, dfa_std = MFDFA(X, lag, order = order, q = q,
+                                    stat = True)
+
+        assert np.array_equal(lag_, lag_d), "Lags mismatch"
+        assert f.shape == (lag_.size, q.size, 4, 4), "Shape mismatch"
+        assert np.allclose(f, f.swapaxes(2, 3)), "Not symmetric"
+
+        # The auto-correlations are the ones of MFDFA
+        assert np.allclose(np.diagonal(f, axis1 = 2, axis2 = 3), dfa), \
+            "Diagonal mismatch"
+        assert np.allclose(np.diagonal(f_std, axis1 = 2, axis2 = 3),
+                           dfa_std), "Diagonal std mismatch"
+
+        # The detrended cross-correlation coefficients
+        assert np.allclose(np.diagonal(rho, axis1 = 1, axis2 = 2), 1), \
+            "Coefficient of a series not 1"
+        assert np.all(np.abs(rho) <= 1 + 1e-12), "Coefficient out of range"
+        assert np.allclose(rho[:5, 0, 1], 0.5, atol = 0.05), \
+            "Coefficient of correlated series mismatch"
+        assert np.allclose(rho[:5, 0, 2], -np.sqrt(0.5), atol = 0.05), \
+            "Coefficient of anticorrelated series mismatch"
+        assert np.allclose(rho[:5, 0, 3], 0, atol = 0.05), \
+            "Coefficient of independent series mismatch"
+
+    # A list of two series, and a prepared profile
+    lag_, f = MFDXA([X[:, 0], X[:, 1]], lag, q = q)
+    assert np.allclose(f, MFDXA(X[:, :2], lag, q = q)[1]), "List mismatch"
+
+    lag_, f = MFDXA(Profile(X, modified = True), lag, q = q)
+    assert np.allclose(f, MFDXA(X, lag, q = q, modified = True)[1]), \
+        "Profile mismatch"
+
+    # Cross-correlation of a series with itself
+    lag_, f = MFDXA([X[:, 0], X[:, 0]], lag, q = q)
+    assert np.allclose(f[:, :, 0, 1], f[:, :, 0, 0]), \
+        "Cross-correlation with itself mismatch"
@@ -0,0 +1,49 @@
+import numpy as np
+
+import sys
+sys.path.append("../")
+from MFDFA import MFDFA
+
+def test_moments():
+    for N in [1000, 10000]:
+        for order in [0, 1, 2]:
+
+            X = np.random.normal(size = N, loc = 0)
+            q = np.linspace(-10, 10, 6)
+
+            lag = np.unique(
+                  np.logspace(
+                  0, np.log10(X.size // 4), 50
+                  ).astype(int) + 1
+                )
+
+            for extensions in [{}, {'window': 5}]:
+                lag_, dfa = MFDFA(X, lag=lag, q=q, order=order,
+                  extensions = extensions)
+
+                lag_m, dfa_m = MFDFA(X, lag=lag, q=q, order=order,
+                  extensions = extensions, backend='moments')
+
+                assert np.array_equal(lag_, lag_m), "Lags mismatch"
+                assert np.allclose(dfa, dfa_m, rtol=1e-6), \
+                    "Moments backend does not match projection backend"
+
+def test_moments_smooth():
+    # Smooth profiles of long series, whose residuals the difference of the
+    # sums cannot resolve
+    rng = np.random.default_rng(3)
+    X = np.cumsum(rng.normal(size = 10 ** 6))
+    q = np.array([-4, -2, 2])
+
+    lag = np.unique(np.logspace(1, 5, 12).astype(int))
+
+    for order in [2, 3]:
+        lag_, dfa = MFDFA(X, lag = lag, q = q, order = order,
+                          modified = True)
+
+        lag_m, dfa_m = MFDFA(X, lag = lag, q = q, order = order,
+                             modified = True, backend = 'moments')
+
+        assert np.all(dfa_m > 0), "Vanishing fluctuation function"
+        assert np.allclose(dfa, dfa_m, rtol = 1e-5), \
+            "Moments backend does not match projection backend"
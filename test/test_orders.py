@@ -0,0 +1,42 @@
+import numpy as np
+
+import sys
+sys.path.append("../")
+from MFDFA import MFDFA
+from MFDFA.MFDFA import _detrended_variance, _detrended_variances
+
+def test_detrended_variances():
+    Y_ = np.cumsum(np.random.normal(size = (10, 4, 50)), axis=2)
+    orders = (3, 0, 1, 2)
+
+    F = _detrended_variances(Y_, orders)
+    assert F.shape == (10, 4, 4), "Detrended variances shape mismatch"
+
+    for k, order in enumerate(orders):
+        assert np.allclose(F[..., k], _detrended_variance(Y_, order)), \
+            "Nested detrended variance mismatch"
+
+def test_orders():
+    for M in [1, 2]:
+        for backend in ['projection', 'moments']:
+            for extensions in [{'eDFA': True}, {'eDFA': True, 'window': 5}]:
+
+                X = np.random.normal(size = (3000, M), loc = 0).squeeze()
+                q = np.linspace(-10, 10, 6)
+
+                lag = np.unique(np.logspace(0, np.log10(750), 25).astype(int) + 1)
+
+                orders = [1, 2, 3]
+
+                res = MFDFA(X, lag=lag, q=q, order=orders, stat = True,
+                  extensions = extensions, backend = backend)
+
+                assert res[1].shape[-1] == len(orders), "Orders axis missing"
+
+                for k, order in enumerate(orders):
+                    res_ = MFDFA(X, lag=res[0], q=q, order=order, stat = True,
+                      extensions = extensions, backend = backend)
+
+                    for r, r_ in zip(res[1:], res_[1:]):
+                        assert np.allclose(r[..., k], r_, rtol = 1e-5), \
+                            "Multi-order MFDFA mismatch"
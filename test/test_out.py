@@ -0,0 +1,38 @@
+import numpy as np
+
+import sys
+sys.path.append("../")
+from MFDFA import MFDFA
+
+def test_out():
+    for M in [1, 3]:
+        X = np.random.normal(size = (2000, M), loc = 0)
+        q = np.linspace(-10, 10, 6)
+
+        lag = np.unique(np.logspace(0, np.log10(500), 25).astype(int) + 1)
+
+        lag_, dfa, dfa_std, edfa = MFDFA(X, lag=lag, q=q, order=1,
+          stat = True, extensions = {'eDFA': True, 'window': 3})
+
+        out = (np.empty_like(dfa), np.empty_like(dfa_std),
+               np.empty_like(edfa))
+
+        res = MFDFA(X, lag=lag, q=q, order=1, stat = True,
+          extensions = {'eDFA': True, 'window': 3}, out = out)
+
+        for r, o, r_ in zip(res[1:], out, (dfa, dfa_std, edfa)):
+            assert r is o, "Result not written into 'out'"
+            assert np.allclose(o, r_), "Result in 'out' mismatch"
+
+        # A single array for f
+        f = np.empty_like(dfa)
+        _, res = MFDFA(X, lag=lag, q=q, order=1, out = f)
+        assert res is f, "Result not written into 'out'"
+
+        # Wrong number or shape of arrays
+        for out in [(f, f), np.empty((1, 1))]:
+            try:
+                MFDFA(X, lag=lag, q=q, order=1, out = out)
+                raise AssertionError("Wrong 'out' not caught")
+            except ValueError:
+                pass
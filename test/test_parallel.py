@@ -0,0 +1,34 @@
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+
+import sys
+sys.path.append("../")
+from MFDFA import MFDFA
+
+def test_parallel():
+    for backend in ['projection', 'moments']:
+        for extensions in [{}, {'eDFA': True, 'window': 5}]:
+
+            X = np.random.normal(size = (5000, 2), loc = 0)
+            q = np.linspace(-10, 10, 6)
+
+            lag = np.unique(np.logspace(0, np.log10(1250), 30).astype(int) + 1)
+
+            res = MFDFA(X, lag=lag, q=q, order=1, stat = True,
+              extensions = extensions, backend = backend)
+
+            for executor in ['thread', 'process']:
+                res_ = MFDFA(X, lag=lag, q=q, order=1, stat = True,
+                  extensions = extensions, backend = backend, n_jobs = 2,
+                  executor = executor)
+
+                for r, r_ in zip(res, res_):
+                    assert np.allclose(r, r_), "Parallel MFDFA mismatch"
+
+            with ThreadPoolExecutor(2) as executor:
+                res_ = MFDFA(X, lag=lag, q=q, order=1, stat = True,
+                  extensions = extensions, backend = backend,
+                  executor = executor)
+
+            for r, r_ in zip(res, res_):
+                assert np.allclose(r, r_), "Parallel MFDFA mismatch"
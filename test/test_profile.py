@@ -0,0 +1,28 @@
+import numpy as np
+
+import sys
+sys.path.append("../")
+from MFDFA import MFDFA, Profile
+
+def test_profile():
+    for M in [1, 3]:
+        X = np.random.normal(size = (3000, M), loc = 0).squeeze()
+        q = np.linspace(-10, 10, 6)
+
+        lag = np.unique(np.logspace(0, np.log10(750), 25).astype(int) + 1)
+
+        for modified in [False, True]:
+            profile = Profile(X, modified = modified)
+            assert profile.Y.shape == (M, 3000), "Profile shape mismatch"
+
+            for order in [1, 2]:
+                for extensions in [{}, {'eDFA': True, 'window': 5}]:
+                    res = MFDFA(X, lag=lag, q=q, order=order, stat = True,
+                      modified = modified, extensions = extensions)
+
+                    res_ = MFDFA(profile, lag=lag, q=q, order=order,
+                      stat = True, extensions = extensions)
+
+                    for r, r_ in zip(res, res_):
+                        assert r.shape == r_.shape, "Profile shape mismatch"
+                        assert np.allclose(r, r_), "Profile MFDFA mismatch"
@@ -0,0 +1,45 @@
+import numpy as np
+
+import sys
+sys.path.append("../")
+from MFDFA import MFDFA, StreamingMFDFA
+from MFDFA import singspect
+from MFDFA.MFDFA import _detrended_variance
+
+def test_q0():
+    X = np.random.normal(size = 5000, loc = 0)
+    lag = np.unique(np.logspace(0, np.log10(1250), 30).astype(int) + 2)
+    q = np.array([-1e-4, 0, 1e-4, 2])
+
+    lag, dfa, dfa_std = MFDFA(X, lag=lag, q=q, order=1, stat = True)
+
+    assert dfa.shape == (lag.size, q.size), "q = 0 removed"
+
+    # The logarithmic average is the limit q → 0
+    assert np.allclose(dfa[:, 0], dfa[:, 1], rtol = 1e-3), "q = 0 mismatch"
+    assert np.allclose(dfa[:, 2], dfa[:, 1], rtol = 1e-3), "q = 0 mismatch"
+
+    # Directly from the variances of the segments
+    Y = np.cumsum(X - X.mean())
+    for n, i in enumerate(lag):
+        N_ = X.size - X.size % i
+        F = np.concatenate([
+            _detrended_variance(Y[:N_].reshape(-1, i), 1),
+            _detrended_variance(Y[X.size % i:].reshape(-1, i), 1)
+        ])
+        assert np.isclose(dfa[n, 1], np.exp(np.mean(np.log(F)) / 2)), \
+            "Logarithmic average mismatch"
+        assert np.isclose(dfa_std[n, 1], np.exp(np.std(np.log(F)) / 2)), \
+            "Logarithmic standard deviation mismatch"
+
+    # Spectrum through q = 0
+    q = np.linspace(-5, 5, 11)
+    lag, dfa = MFDFA(X, lag=lag, q=q, order=1)
+    q_, hq = singspect.hurst_exponents(lag, dfa, q=q)
+    assert q_.size == q.size, "q = 0 removed from the spectrum"
+    assert np.all(np.isfinite(hq)), "Spectrum not finite at q = 0"
+
+    stream = StreamingMFDFA(lag, order=1, q=q)
+    stream.update(X)
+    _, f = stream.fluctuation()
+    assert np.all(np.isfinite(f[:, 5])), "Streaming q = 0 not finite"
@@ -0,0 +1,20 @@
+import numpy as np
+
+import sys
+sys.path.append("../")
+from MFDFA.MFDFA import _q_moments
+
+def test_q_moments():
+    F = np.random.uniform(1e-3, 10, size = (3, 1000, 2))
+    q = np.linspace(-10, 10, 6).reshape(-1, 1, 1, 1)
+
+    P = np.float_power(F, q / 2)
+
+    for memory in [2 ** 8, 2 ** 14, 2 ** 27]:
+        mean, std = _q_moments(F, q, True, memory)
+
+        assert np.allclose(mean, np.mean(P, axis=2)), "Blocked mean mismatch"
+        assert np.allclose(std, np.std(P, axis=2)), "Blocked std mismatch"
+
+        mean, std = _q_moments(F, q, False, memory)
+        assert std is None, "std without stat"
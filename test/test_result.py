@@ -0,0 +1,83 @@
+import numpy as np
+
+import pickle
+import sys
+sys.path.append("../")
+from MFDFA import MFDFA, MFDFAResult, Profile
+from MFDFA.MFDFA import _detrended_variances
+from MFDFA.singspect import hurst_exponents, spectrum
+
+def test_result():
+    rng = np.random.default_rng(5)
+    X = np.cumsum(rng.normal(size = 2 ** 12))
+    lag = np.unique(np.logspace(0.7, 2.5, 12).astype(int))
+    q = np.linspace(-4, 4, 9)
+
+    res = MFDFA(X, lag, q = q, stat = True, extensions = {'eDFA': True})
+
+    # Unpacks and indexes as the tuple of results
+    assert isinstance(res, MFDFAResult) and isinstance(res, tuple), \
+        "Result type mismatch"
+    lag_, f, f_std, f_eDFA = res
+    assert len(res) == 4 and res[1] is f and res.f is f, \
+        "Result tuple mismatch"
+    assert res.f_std is f_std and res.f_eDFA is f_eDFA, \
+        "Result attributes mismatch"
+    assert MFDFA(X, lag, q = q).f_std is None, "Unrequested std"
+    assert len(MFDFA(X, lag, q = q, stat = True)) == 3, \
+        "Result length mismatch"
+
+    # The spectrum of singspect, calculated once
+    q_, hq, tau, alpha, f_alpha = spectrum(lag_, f, q)
+    assert np.allclose(res.hurst, hq), "Hurst exponents mismatch"
+    assert np.allclose(res.tau, tau), "Scaling exponents mismatch"
+    assert np.allclose(res.alpha, alpha), "Singularity strength mismatch"
+    assert np.allclose(res.f_alpha, f_alpha), \
+        "Singularity spectrum mismatch"
+    assert res.alpha is res.alpha, "Spectrum recalculated"
+    assert res.spectrum([None, None]) is res.spectrum([None, None]), \
+        "Spectrum of other limits recalculated"
+
+    # A single q has its Hurst exponent
+    lag_, f = res_ = MFDFA(X, lag, q = 2)
+    assert np.allclose(res_.hurst, hurst_exponents(lag_, f, 2)[1]), \
+        "Single q Hurst exponent mismatch"
+
+    # The variances of the segments, as the ones of the profile
+    Y = np.cumsum(X - np.mean(X))
+    for i, F in zip(lag_, res.variances):
+        S = X.size // i
+        F_ = _detrended_variances(Y[:S * i].reshape(1, S, i), (1,))
+        assert np.allclose(F[:S], F_[0, :, 0]), "Variances mismatch"
+        assert np.allclose(np.mean(F) ** 0.5, res.f[lag_ == i, 6]), \
+            "Variances and fluctuation function mismatch"
+
+    # Not changed by later changes of the timeseries
+    X_ = X.copy()
+    res = MFDFA(X_, lag, q = q)
+    X_[:] = np.cumsum(X_)
+    for n, F in enumerate(res.variances):
+        assert np.allclose(np.mean(F) ** 0.5, res.f[n, 6]), \
+            "Variances changed with the timeseries"
+
+    # With several timeseries and orders, and of a profile
+    X_ = np.stack((X, rng.normal(size = X.size)), axis = 1)
+    res = MFDFA(Profile(X_), lag, q = q, order = [1, 2])
+    assert res.hurst.shape == (q.size, 2, 2), "Hurst exponents shape mismatch"
+    assert res.variances[0].shape == (2 * (X.size // lag_[0]), 2, 2), \
+        "Variances shape mismatch"
+
+    # A copy keeps the results
+    res_ = pickle.loads(pickle.dumps(res))
+    assert type(res_) is MFDFAResult and len(res_) == 2, \
+        "Pickled result mismatch"
+    assert np.allclose(res_.alpha, res.alpha), "Pickled spectrum mismatch"
+
+    # Not available for a list of timeseries
+    res = MFDFA([X, X[:1000]], lag, q = q)
+    assert res.hurst.shape == (q.size, 2), "Hurst exponents shape mismatch"
+    try:
+        res.variances
+        assert False, "Variances of a list of timeseries"
+    except ValueError:
+        pass
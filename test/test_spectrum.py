@@ -40,3 +40,52 @@ def test_spectrum():
                 singspect._slopes(lag, dfa, q[0:3])
             except Exception:
                 pass
+
+def test_combined_spectrum():
+    X = np.cumsum(np.random.normal(0, 5, size=5000))
+    q = np.linspace(-10, 10, 21)
+
+    lag = np.unique(np.logspace(0, np.log10(X.size // 4), 55).astype(int) + 3)
+    lag, dfa = MFDFA(X, lag=lag, q=q, order=1)
+
+    res = singspect.spectrum(lag, dfa, q=q)
+
+    alpha, f = singspect.singularity_spectrum(lag, dfa, q=q)
+    _, tau = singspect.scaling_exponents(lag, dfa, q=q)
+    _, hq = singspect.hurst_exponents(lag, dfa, q=q)
+
+    assert np.allclose(res.alpha, alpha), "Combined spectrum mismatch"
+    assert np.allclose(res.f, f), "Combined spectrum mismatch"
+    assert np.allclose(res.tau, tau), "Combined spectrum mismatch"
+    assert np.allclose(res.hq, hq), "Combined spectrum mismatch"
+
+    # Slopes of the least-square fits
+    a, b = lag.size // 8, int(lag.size // 1.5)
+    for i in range(q.size):
+        slope = np.polyfit(np.log(lag[a:b]), np.log(dfa[a:b, i]), 1)[0]
+        assert np.isclose(res.hq[i], slope), "Slope mismatch"
+
+    # The default limits follow the lags of each call
+    _, hq_ = singspect.hurst_exponents(lag[:30], dfa[:30], q=q)
+    _, hq = singspect.hurst_exponents(lag[:30], dfa[:30], q=q,
+                                      lim=[30 // 8, int(30 // 1.5)])
+    assert np.allclose(hq_, hq), "Default limits shared between calls"
+
+def test_batched_spectrum():
+    X = np.cumsum(np.random.normal(0, 5, size=(5000, 4)), axis=0)
+    q = np.linspace(-10, 10, 21)
+
+    lag = np.unique(np.logspace(0, np.log10(5000 // 4), 55).astype(int) + 3)
+    lag, dfa = MFDFA(X, lag=lag, q=q, order=1)
+
+    res = singspect.spectrum(lag, dfa, q=q)
+    alpha, f = singspect.singularity_spectrum(lag, dfa, q=q)
+    _, tau = singspect.scaling_exponents(lag, dfa, q=q)
+
+    for r in res[1:] + (alpha, f, tau):
+        assert r.shape == (q.size, 4), "Batched spectrum shape mismatch"
+
+    for m in range(4):
+        res_ = singspect.spectrum(lag, dfa[..., m], q=q)
+        for r, r_ in zip(res[1:], res_[1:]):
+            assert np.allclose(r[:, m], r_), "Batched spectrum mismatch"
@@ -0,0 +1,43 @@
+import numpy as np
+
+import sys
+sys.path.append("../")
+from MFDFA import MFDFA, StreamingMFDFA
+
+def test_streaming():
+    for N in [1024, 8192]:
+        for order in [1, 2]:
+
+            X = np.random.normal(size = N, loc = 0)
+            q = np.linspace(-10, 10, 6)
+
+            # Lags dividing N, such that the segmentation from the beginning
+            # and from the end of MFDFA coincide
+            lag = 2 ** np.arange(2, 9)
+
+            lag_, dfa, dfa_std = MFDFA(X, lag=lag, q=q, order=order,
+              stat = True)
+
+            stream = StreamingMFDFA(lag, order=order, q=q, stat=True)
+
+            # Chunks of random sizes
+            cuts = np.sort(np.random.randint(0, N, size = 20))
+            for chunk in np.split(X, cuts):
+                stream.update(chunk)
+
+                # Only the profile of incomplete segments is kept
+                assert stream._profile.size < lag.max(), "Profile not trimmed"
+
+            lag_s, dfa_s, dfa_std_s = stream.fluctuation()
+
+            assert np.array_equal(lag_, lag_s), "Lags mismatch"
+            assert np.allclose(dfa, dfa_s), "Streaming MFDFA mismatch"
+            assert np.allclose(dfa_std, dfa_std_s), \
+                "Streaming MFDFA std mismatch"
+
+    # At least a lag > order + 1
+    try:
+        StreamingMFDFA(np.array([2, 3]), order = 2)
+        assert False, "No error without lags"
+    except ValueError:
+        pass
@@ -0,0 +1,38 @@
+import numpy as np
+
+import sys
+sys.path.append("../")
+from MFDFA import fgn, surrogates, significance
+
+def test_surrogates():
+    X = fgn(2000, 0.75)
+
+    for method in ['shuffle', 'phase', 'iaaft']:
+        S = surrogates(X, 4, method=method, seed=1)
+        assert S.shape == (2000, 4), "Surrogates shape mismatch"
+
+        S_ = surrogates(X, 4, method=method, seed=1)
+        assert np.allclose(S, S_), "Surrogates not reproducible"
+
+        # The distribution is kept
+        if method != 'phase':
+            assert np.allclose(np.sort(S, axis=0), np.sort(X)[:, None]), \
+                "Distribution not kept"
+
+        # The power spectrum is kept
+        if method == 'phase':
+            assert np.allclose(np.abs(np.fft.rfft(S, axis=0)),
+                               np.abs(np.fft.rfft(X))[:, None]), \
+                "Power spectrum not kept"
+
+def test_significance():
+    X = fgn(2000, 0.75)
+    q = np.linspace(-4, 4, 9)
+    lag = np.unique(np.logspace(1, np.log10(500), 20).astype(int))
+
+    res = significance(X, lag, q, n = 20, seed = 1, memory = 2 ** 17)
+
+    assert res.dh_null.shape == (20,), "Null distribution shape mismatch"
+    assert res.dalpha_null.shape == (20,), "Null distribution shape mismatch"
+    assert 0 < res.p_h <= 1 and 0 < res.p_alpha <= 1, "p-value not in (0, 1]"
+    assert np.all(np.isfinite(res.dh_null)), "Null distribution not finite"
@@ -0,0 +1,36 @@
+import numpy as np
+from numpy.polynomial.polynomial import polyfit, polyval
+
+import sys
+sys.path.append("../")
+from MFDFA import MFDFA
+
+def test_window():
+    for N in [1000, 2000]:
+        for window in [1, 3, 32]:
+
+            X = np.random.normal(size = N, loc = 0)
+            Y = np.cumsum(X - np.mean(X))
+
+            lag = np.unique(np.logspace(0, np.log10(N // 4), 15).astype(int))
+
+            lag, dfa = MFDFA(X, lag=lag, q=2, order=1,
+              extensions = {'window': window})
+
+            # Small memory blocks give the same result
+            _, dfa_m = MFDFA(X, lag=lag, q=2, order=1,
+              extensions = {'window': window}, memory = 2 ** 12)
+
+            assert np.allclose(dfa, dfa_m), "Blocked window mismatch"
+
+            # Reference with a polynomial fit at each window displacement
+            for n, i in enumerate(lag):
+                F = []
+                X_ = np.linspace(1, i, i)
+                for j in range(0, i - 1, window):
+                    Y_ = Y[j:j + (N - j) // i * i].reshape(-1, i)
+                    p = polyfit(X_, Y_.T, 1)
+                    F.append(np.var(Y_ - polyval(X_, p), axis=1))
+
+                assert np.isclose(dfa[n, 0], np.sqrt(np.mean(np.hstack(F)))),\
+                    "Moving window mismatch"